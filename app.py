@@ -4,15 +4,32 @@ from flask_cors import CORS
 from coe.api.routes import api_bp 
 from coe.api.user.routes import user_api 
 from coe.api.task.routes import task_api 
+from coe.api.admin.routes import admin_api
 from coe.models.base import db
 from config import Config
 from werkzeug.exceptions import Unauthorized
+from coe.utils.sql_utils import set_local_statement_timeout
+from coe.utils.replica_utils import init_replica_routing
+from coe.utils.instrumentation_utils import init_request_instrumentation
+from coe.utils.query_budget_utils import set_default_budget_mode
+from coe.utils.metrics_utils import init_request_metrics
+from coe.utils.slow_query_utils import init_slow_query_log
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
 
     db.init_app(app)
+    if Config.DB_PGBOUNCER_MODE and Config.DB_STATEMENT_TIMEOUT_MS > 0:
+        set_local_statement_timeout(db.session, Config.DB_STATEMENT_TIMEOUT_MS)
+    init_replica_routing(app, Config.READ_YOUR_WRITES_SECONDS, Config.REPLICA_HEALTH_CHECK_SECONDS)
+    if Config.REQUEST_TIMING_ENABLED:
+        init_request_instrumentation(app, Config.REQUEST_PROFILE_SAMPLE_RATE, Config.REQUEST_PROFILE_THRESHOLD_MS, Config.REQUEST_PROFILE_DIR)
+    set_default_budget_mode(Config.QUERY_BUDGET_MODE)
+    if Config.METRICS_ENABLED:
+        init_request_metrics(app, lambda: db.engines, Config.DB_MAX_OVERFLOW)
+    if Config.SLOW_QUERY_THRESHOLD_MS > 0:
+        init_slow_query_log(Config.SLOW_QUERY_THRESHOLD_MS, Config.SLOW_QUERY_LOG_SIZE, Config.SLOW_QUERY_EXPLAIN, Config.SLOW_QUERY_EXPLAIN_TIMEOUT_MS)
 
     CORS(app, resources={r"/*": {"origins": Config.ALLOWED_ORIGINS}}, supports_credentials=True)
 
@@ -26,6 +43,7 @@ def create_app():
     api.add_namespace(api_bp, path="/")
     api.add_namespace(user_api, path="/user")
     api.add_namespace(task_api, path="/task")
+    api.add_namespace(admin_api, path="/admin")
 
     return app
 
@@ -0,0 +1,232 @@
+"""Measure latency and throughput of the main API endpoints against a seeded dataset.
+
+Requests go through Flask's test client in-process, so the numbers cover
+routing, services, serialization and the database, but not an HTTP server.
+Every scenario runs `--requests` requests from `--concurrency` threads, each
+logged in as its own benchmark user; seed the data first with benchmarks.seed.
+
+Results are written as JSON. With `--baseline`, scenarios whose p50/p99 grew,
+or whose requests per second dropped, by more than `--tolerance` are listed
+and the run exits with status 1.
+
+Usage:
+    python -m benchmarks.seed --dataset 100k
+    python -m benchmarks.api --output results.json --baseline baseline.json --tolerance 0.2
+"""
+import argparse
+import itertools
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from urllib.parse import urlencode
+
+from sqlalchemy import func, select
+
+from benchmarks.seed import BENCH_EMAIL, BENCH_PASSWORD, bench_users_condition, describe_dataset
+from coe.models.base import db
+from coe.models.task import Task
+from coe.models.user import User
+from coe.schemas.task import TaskFilters, TaskSort
+from coe.services.task_service import get_tasks_list, task_list_columns, encode_task_cursor
+from config import Config
+
+LIST_FILTERS = {
+    "all": {},
+    "status": {"status": "pending"},
+    "priority": {"priority": "high"},
+    "status+priority": {"status": "in_progress", "priority": "low"},
+    "search": {"search": None},  # filled with a word from the seeded names
+}
+LIST_SORTS = ("id", "name", "dueDate", "startDate", "priority")
+SORT_ORDERS = ("asc", "desc")
+PAGE_SIZE = 20
+METRICS = ("p50_ms", "p99_ms", "rps")
+
+
+def summarize(latencies: list, errors: int, elapsed: float) -> dict:
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(p99 * 1000, 2),
+    }
+
+
+def compare_results(current: dict, baseline: dict, tolerance: float) -> list:
+    """Describe every scenario in both runs that got slower than `tolerance` allows."""
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        for metric in METRICS:
+            # Latencies regress upwards, throughput downwards
+            change = (base[metric] - result[metric]) / base[metric] if metric == "rps" else (result[metric] - base[metric]) / base[metric]
+            if change > tolerance:
+                regressions.append(f"{name}: {metric} {base[metric]} -> {result[metric]} ({change:+.0%} worse)")
+    return regressions
+
+
+class Runner:
+    """Runs scenarios from a thread pool, giving every thread its own logged-in client."""
+
+    def __init__(self, app, users: int, concurrency: int, requests: int):
+        self.app = app
+        self.users = users
+        self.concurrency = concurrency
+        self.requests = requests
+        self._local = threading.local()
+        self._logins = itertools.count()
+
+    def client(self):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+            email = BENCH_EMAIL.format(next(self._logins) % self.users)
+            response = client.post("/user/login", json={"email": email, "password": BENCH_PASSWORD})
+            assert response.status_code == 200, f"Could not log in as {email}, seed the database first"
+            client.set_cookie(key="access_token", value=response.json["accessToken"])
+        return client
+
+    def run(self, name: str, request) -> dict:
+        """Time `request(client, n)` for n in range(requests); anything but 2xx counts as an error."""
+        def call(n):
+            client = self.client()
+            started = time.perf_counter()
+            response = request(client, n)
+            return time.perf_counter() - started, response.status_code >= 300
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            # Warm-up round, so logins and connection setup are not measured
+            list(pool.map(call, range(self.concurrency)))
+            started = time.perf_counter()
+            timings = list(pool.map(call, range(self.requests)))
+            elapsed = time.perf_counter() - started
+
+        result = summarize([latency for latency, _ in timings], sum(failed for _, failed in timings), elapsed)
+        print(f"{name:<42} {result['rps']:>9.1f} req/s   p50 {result['p50_ms']:>8.2f} ms   p99 {result['p99_ms']:>8.2f} ms   errors {result['errors']}")
+        return result
+
+
+def list_scenarios(search_word: str, deep_page: int, deep_cursor: str) -> dict:
+    scenarios = {}
+    for (filter_name, filters), sort_by, sort_order in itertools.product(LIST_FILTERS.items(), LIST_SORTS, SORT_ORDERS):
+        params = {key: value or search_word for key, value in filters.items()}
+        params.update(sortBy=sort_by, sortOrder=sort_order, records_per_page=PAGE_SIZE)
+        scenarios[f"task_list:{filter_name}:{sort_by}:{sort_order}"] = f"/task/list?{urlencode(params)}"
+
+    deep = {"sortBy": "dueDate", "sortOrder": "asc", "records_per_page": PAGE_SIZE, "withTotal": "false"}
+    scenarios["task_list:deep_offset"] = f"/task/list?{urlencode({**deep, 'page': deep_page})}"
+    scenarios["task_list:deep_cursor"] = f"/task/list?{urlencode({**deep, 'cursor': deep_cursor})}"
+    return scenarios
+
+
+def prepare(session, dataset: dict) -> dict:
+    """Pick task ids, a search word and a deep cursor from the seeded data."""
+    bench_tasks = select(Task.id, Task.name).join(User, Task.created_by_id == User.id).where(bench_users_condition())
+    sample = session.execute(bench_tasks.order_by(func.random()).limit(1_000)).all()
+    assert sample, "No benchmark tasks found, seed the database first"
+
+    # Half way through the table, for both offset and keyset paging
+    depth = dataset["tasks"] // 2
+    sort = TaskSort(sort_by="dueDate", sort_order="asc")
+    rows, _ = get_tasks_list(session, TaskFilters(), sort, skip=depth, limit=1, with_total=False, columns=task_list_columns(sort))
+
+    return {
+        "task_ids": [task_id for task_id, _ in sample],
+        "search_word": sample[0].name.split()[0],
+        "deep_page": depth // PAGE_SIZE + 1,
+        "deep_cursor": encode_task_cursor(rows[0], sort, "next"),
+    }
+
+
+def run_benchmarks(app, runner: Runner, targets: dict) -> dict:
+    results = {}
+    for name, url in list_scenarios(targets["search_word"], targets["deep_page"], targets["deep_cursor"]).items():
+        results[name] = runner.run(name, lambda client, n, url=url: client.get(url))
+
+    task_ids = targets["task_ids"]
+    results["task_get"] = runner.run("task_get", lambda client, n: client.get(f"/task/{task_ids[n % len(task_ids)]}"))
+
+    today = date.today()
+    results["task_add"] = runner.run("task_add", lambda client, n: client.post("/task/add", json={
+        "name": f"Benchmark task {n}",
+        "description": "Created by the benchmark suite",
+        "dueDate": str(today + timedelta(days=n % 365)),
+        "priority": "medium",
+    }))
+
+    results["user_me"] = runner.run("user_me", lambda client, n: client.get("/user/me"))
+
+    # Last, since logging in as someone else replaces the thread's cookie
+    users = runner.users
+    results["user_login"] = runner.run("user_login", lambda client, n: client.post("/user/login", json={
+        "email": BENCH_EMAIL.format(random.randrange(users)),
+        "password": BENCH_PASSWORD,
+    }))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", help="results file of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression, e.g. 0.2 for 20%%")
+    args = parser.parse_args()
+
+    from app import app
+
+    with app.app_context():
+        dataset = describe_dataset(db.session)
+        targets = prepare(db.session, dataset)
+        db.session.remove()
+
+    print(f"{dataset['tasks']} tasks, {dataset['users']} users, {args.requests} requests per scenario, {args.concurrency} threads")
+    runner = Runner(app, dataset["users"], args.concurrency, args.requests)
+    current = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "dataset": dataset,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "settings": {
+                "TASK_LIST_CACHE_BACKEND": Config.TASK_LIST_CACHE_BACKEND,
+                "TASK_LIST_RENDER_IN_DATABASE": Config.TASK_LIST_RENDER_IN_DATABASE,
+                "TASK_ASYNC_ROUTES": Config.TASK_ASYNC_ROUTES,
+                "BCRYPT_ROUNDS": Config.BCRYPT_ROUNDS,
+                "DB_POOL_SIZE": Config.DB_POOL_SIZE,
+            },
+        },
+        "results": run_benchmarks(app, runner, targets),
+    }
+
+    with open(args.output, "w") as f:
+        json.dump(current, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline["meta"]["dataset"]["tasks"] != dataset["tasks"]:
+            print(f"Warning: the baseline ran against {baseline['meta']['dataset']['tasks']} tasks")
+
+        regressions = compare_results(current, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} of {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
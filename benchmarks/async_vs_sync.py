@@ -0,0 +1,103 @@
+"""Compare task list throughput of the sync and async services at high concurrency.
+
+Runs the same get_tasks_list call `--requests` times with `--concurrency`
+callers in flight:
+
+* sync:          a thread pool of `--workers` threads on a QueuePool engine,
+                 the way the sync Flask workers run today;
+* async-pooled:  one event loop with a pooled asyncpg engine, as an ASGI
+                 deployment would run async_task_service;
+* async-nullpool: one event loop through async_task_service.run_in_session,
+                 the NullPool setup Flask's per-request event loops require.
+
+Usage:
+    python -m benchmarks.async_vs_sync --requests 2000 --concurrency 200 --workers 8
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from config import Config
+from coe.schemas.task import TaskFilters, TaskSort
+from coe.services import task_service, async_task_service
+
+FILTERS = TaskFilters(status="pending")
+SORT = TaskSort(sort_by="dueDate", sort_order="asc")
+
+
+def report(name: str, latencies: list, elapsed: float):
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{name:<16} {len(latencies) / elapsed:>9.1f} req/s   p50 {statistics.median(latencies) * 1000:>7.2f} ms   p99 {p99 * 1000:>7.2f} ms")
+
+
+def run_sync(requests: int, workers: int):
+    engine = create_engine(Config.SQLALCHEMY_DATABASE_URI, pool_size=workers, max_overflow=0)
+    Session = sessionmaker(engine)
+
+    def call(_):
+        started = time.perf_counter()
+        with Session() as db:
+            task_service.get_tasks_list(db, FILTERS, SORT, limit=50, columns=task_service.TASK_RESPONSE_COLUMNS)
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # Warm-up round so connection setup is not part of the measurement
+        list(pool.map(call, range(workers)))
+        started = time.perf_counter()
+        latencies = list(pool.map(call, range(requests)))
+    report("sync", latencies, time.perf_counter() - started)
+    engine.dispose()
+
+
+async def run_async(name: str, requests: int, concurrency: int, run, warm_up: bool = True):
+    limiter = asyncio.Semaphore(concurrency)
+
+    async def call():
+        async with limiter:
+            started = time.perf_counter()
+            await run(async_task_service.get_tasks_list, filters=FILTERS, sort=SORT, limit=50, columns=task_service.TASK_RESPONSE_COLUMNS)
+            return time.perf_counter() - started
+
+    if warm_up:
+        await asyncio.gather(*(call() for _ in range(concurrency)))
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(call() for _ in range(requests)))
+    report(name, latencies, time.perf_counter() - started)
+
+
+async def run_async_pooled(requests: int, concurrency: int):
+    engine = create_async_engine(Config.ASYNC_DATABASE_URI, pool_size=concurrency, max_overflow=0)
+    Session = async_sessionmaker(engine)
+
+    async def run(fn, **kwargs):
+        async with Session() as db:
+            return await fn(db=db, **kwargs)
+
+    await run_async("async-pooled", requests, concurrency, run)
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200, help="callers in flight for the async runs")
+    parser.add_argument("--workers", type=int, default=8, help="threads (and pooled connections) for the sync run")
+    args = parser.parse_args()
+
+    print(f"{args.requests} list queries, {args.concurrency} concurrent async callers, {args.workers} sync workers")
+    run_sync(args.requests, args.workers)
+    asyncio.run(run_async_pooled(args.requests, args.concurrency))
+    # Every call opens its own connection here, so there is nothing to warm up
+    asyncio.run(run_async("async-nullpool", args.requests, args.concurrency, async_task_service.run_in_session, warm_up=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Seed the configured database with a large synthetic task dataset for benchmarking.
+
+Benchmark users are `bench-user-<n>@example.com` with the password
+BENCH_PASSWORD; re-seeding deletes them first, and their tasks go with them
+through the created_by foreign key.
+
+Usage:
+    python -m benchmarks.seed --dataset 100k
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from faker import Faker
+from sqlalchemy import delete, func, insert, select, text
+
+from coe.models.base import db
+from coe.models.task import Task, PriorityEnum, StatusEnum
+from coe.models.user import User
+from coe.services.password_service import hash_password
+
+# dataset name -> (tasks, users)
+DATASETS = {
+    "10k": (10_000, 1_000),
+    "100k": (100_000, 2_000),
+    "1m": (1_000_000, 5_000),
+}
+BENCH_EMAIL = "bench-user-{}@example.com"
+BENCH_PASSWORD = "bench-password"
+
+
+def bench_users_condition():
+    return User.email.like(BENCH_EMAIL.format("%"))
+
+
+def clear_dataset(session):
+    session.execute(delete(User).where(bench_users_condition()))
+    session.commit()
+
+
+def seed_dataset(session, tasks: int, users: int, batch_size: int = 10_000, seed: int = 0) -> dict:
+    """Insert `users` benchmark users and `tasks` tasks spread over them, in batches."""
+    clear_dataset(session)
+    rng = random.Random(seed)
+    fake = Faker()
+    fake.seed_instance(seed)
+
+    # One hash for everyone: hashing thousands of passwords would dominate seeding
+    password = hash_password(BENCH_PASSWORD)
+    session.execute(insert(User), [
+        {"first_name": fake.first_name(), "last_name": fake.last_name(), "email": BENCH_EMAIL.format(n), "password": password}
+        for n in range(users)
+    ])
+    user_ids = session.scalars(select(User.id).where(bench_users_condition())).all()
+
+    # Drawing from pools keeps Faker out of the per-row cost for the 1M dataset
+    names = [fake.sentence(nb_words=4).rstrip(".") for _ in range(2_000)]
+    descriptions = [fake.paragraph(nb_sentences=rng.randint(1, 12)) for _ in range(2_000)]
+    priorities = list(PriorityEnum)
+    statuses = list(StatusEnum)
+    today = date.today()
+
+    def make_task():
+        due_date = today + timedelta(days=rng.randint(-365, 365))
+        return {
+            "name": rng.choice(names),
+            "description": rng.choice(descriptions),
+            "created_by_id": rng.choice(user_ids),
+            "assignee_id": rng.choice(user_ids) if rng.random() < 0.8 else None,
+            "due_date": due_date,
+            "start_date": due_date - timedelta(days=rng.randint(0, 60)) if rng.random() < 0.7 else None,
+            "priority": rng.choice(priorities),
+            "status": rng.choice(statuses),
+        }
+
+    for start in range(0, tasks, batch_size):
+        session.execute(insert(Task), [make_task() for _ in range(min(batch_size, tasks - start))])
+        session.commit()
+
+    # Fresh statistics, so plans and the estimated counts match the new table size
+    session.execute(text("ANALYZE users"))
+    session.execute(text("ANALYZE tasks"))
+    session.commit()
+    return describe_dataset(session)
+
+
+def describe_dataset(session) -> dict:
+    """Counts and id range of the seeded benchmark data."""
+    users = session.scalar(select(func.count()).select_from(User).where(bench_users_condition()))
+    bench_tasks = select(Task.id).join(User, Task.created_by_id == User.id).where(bench_users_condition()).subquery()
+    tasks, min_id, max_id = session.execute(select(func.count(), func.min(bench_tasks.c.id), func.max(bench_tasks.c.id))).one()
+    return {"users": users, "tasks": tasks, "min_task_id": min_id, "max_task_id": max_id}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", choices=DATASETS, default="10k")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0, help="random seed, for reproducible datasets")
+    args = parser.parse_args()
+
+    from app import app
+
+    tasks, users = DATASETS[args.dataset]
+    started = time.perf_counter()
+    with app.app_context():
+        summary = seed_dataset(db.session, tasks, users, batch_size=args.batch_size, seed=args.seed)
+    print(f"Seeded {summary['tasks']} tasks for {summary['users']} users in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+from flask import jsonify, make_response
+from flask_restx import Namespace, Resource
+from coe.services.auth_service import login_required, admin_required
+from coe.schemas.admin import SlowQueryListResponse
+from coe.api.admin.swagger_models import define_admin_models
+from coe.utils import slow_query_utils
+
+admin_api = Namespace('Admin', path="/admin", description='Operational endpoints for admins (see ADMIN_EMAILS)', decorators=[admin_required, login_required])
+
+swagger_models = define_admin_models(admin_api)
+
+@admin_api.route("/slow-queries")
+class SlowQueries(Resource):
+    @admin_api.response(200, "Success", swagger_models.slow_query_list_response)
+    @admin_api.response(401, "Unauthorized", swagger_models.error_response)
+    @admin_api.response(403, "Forbidden", swagger_models.error_response)
+    def get(self):
+        """Most recent slow statements first, with their plans once captured."""
+        log = slow_query_utils.slow_query_log
+        result = {
+            "enabled": log is not None,
+            "threshold_ms": log.threshold_ms if log else None,
+            "queries": log.entries() if log else []
+        }
+        response_object = SlowQueryListResponse.model_validate(result)
+        return make_response(jsonify(response_object.model_dump(by_alias=True, mode="json")), 200)
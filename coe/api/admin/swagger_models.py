@@ -0,0 +1,28 @@
+from flask_restx import fields
+from types import SimpleNamespace
+
+def define_admin_models(api):
+    models = SimpleNamespace()
+
+    models.slow_query = api.model('SlowQuery', {
+        'id': fields.Integer(required=True),
+        'recordedAt': fields.DateTime(required=True, attribute='recorded_at'),
+        'durationMs': fields.Float(required=True, attribute='duration_ms'),
+        'statement': fields.String(required=True),
+        'parameters': fields.Raw(required=False, description='Bound parameters with secrets and long text redacted'),
+        'route': fields.String(required=False, description='Method and route that ran the statement'),
+        'plan': fields.Raw(required=False, description='EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) output'),
+        'planStatus': fields.String(required=True, attribute='plan_status', description='not_requested, pending, captured, skipped or failed: <error>')
+    })
+
+    models.slow_query_list_response = api.model('SlowQueryListResponse', {
+        'enabled': fields.Boolean(required=True),
+        'thresholdMs': fields.Float(required=False, attribute='threshold_ms'),
+        'queries': fields.List(fields.Nested(models.slow_query))
+    })
+
+    models.error_response = api.model('AdminErrorResponse', {
+        'detail': fields.String()
+    })
+
+    return models
@@ -1,16 +1,37 @@
+from flask import jsonify, make_response, current_app
 from flask_restx import Namespace, Resource
 from .swagger_models import define_swagger_models
-from coe.schemas.generic import HelloResponse
+from coe.models.base import db
+from coe.schemas.generic import HelloResponse, DBHealthResponse
+from coe.services.health_service import check_db_health
+from coe.utils.metrics_utils import render_metrics
 
 api_bp = Namespace('Generic', description='Generic routes', path='/')
 
-hello_response_model = define_swagger_models(api_bp)
+swagger_models = define_swagger_models(api_bp)
 
 @api_bp.route('hello')
 class Hello(Resource):
-    @api_bp.response(200, "Success", hello_response_model)
+    @api_bp.response(200, "Success", swagger_models.hello_response)
     def get(self):
         response = HelloResponse(
             message="Hello from Flask COE App!"
         )
-        return response
\ No newline at end of file
+        return response
+
+@api_bp.route('health/db')
+class DBHealth(Resource):
+    @api_bp.response(200, "Database reachable", swagger_models.db_health_response)
+    @api_bp.response(503, "Database unavailable", swagger_models.db_health_response)
+    def get(self):
+        result = check_db_health(db.session, db.engine)
+        response_object = DBHealthResponse.model_validate(result)
+        status_code = 200 if response_object.status == "ok" else 503
+        return make_response(jsonify(response_object.model_dump(by_alias=True)), status_code)
+
+@api_bp.route('metrics')
+class Metrics(Resource):
+    @api_bp.response(200, "Metrics in the Prometheus text exposition format")
+    def get(self):
+        body, content_type = render_metrics()
+        return current_app.response_class(body, status=200, content_type=content_type)
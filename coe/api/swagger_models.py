@@ -1,8 +1,28 @@
 from flask_restx import fields
+from types import SimpleNamespace
 
 def define_swagger_models(api):
-    hello_response_model = api.model("HelloResponse", {
+    models = SimpleNamespace()
+
+    models.hello_response = api.model("HelloResponse", {
         "message": fields.String,
     })
 
-    return hello_response_model
+    models.pool_status = api.model("PoolStatus", {
+        "poolClass": fields.String(attribute="pool_class"),
+        "size": fields.Integer,
+        "checkedOut": fields.Integer(attribute="checked_out"),
+        "idle": fields.Integer,
+        "overflow": fields.Integer,
+        "capacity": fields.Integer,
+        "utilization": fields.Float,
+    })
+
+    models.db_health_response = api.model("DBHealthResponse", {
+        "status": fields.String(enum=["ok", "unavailable"]),
+        "latencyMs": fields.Float(attribute="latency_ms"),
+        "detail": fields.String,
+        "pool": fields.Nested(models.pool_status),
+    })
+
+    return models
@@ -1,32 +1,70 @@
-from flask import request, jsonify, make_response
+from flask import request, jsonify, make_response, current_app, stream_with_context
 from flask_restx import Namespace, Resource
 from pydantic import ValidationError
 
 from coe.models.base import db
+from config import Config as settings
 from coe.api.task.swagger_models import define_task_models
 from coe.services.auth_service import login_required, get_current_user
+from coe.services import async_task_service
 from coe.services.task_service import (
-    create_task, find_task_by_id, update_task_details,
-    remove_task, get_tasks_list
+    create_task, bulk_create_tasks, find_missing_users, find_task_by_id, update_task_details,
+    bulk_update_tasks, remove_task, bulk_remove_tasks, fetch_task_page, count_tasks, decode_task_cursor, build_task_cursors,
+    build_page_cursors, iter_task_batches, get_task_list_version, resolve_task_fields,
+    task_list_cache_key, get_cached_task_list, cache_task_list
 )
 from coe.schemas.task import (
     CreateTaskRequestSchema, CreateTaskResponseSchema,
-    GetTaskResponseSchema, GetTaskListResponseSchema,
+    BulkCreateTaskRequestSchema, BulkCreateTaskResponseSchema,
+    BulkUpdateTaskRequestSchema, BulkDeleteTaskRequestSchema, BulkChangeTaskResponseSchema,
+    GetTaskResponseSchema, PaginationSchema,
     UpdateTaskRequestSchema, UpdateTaskResponseSchema,
     DeleteTaskResponseSchema, TaskFilters, TaskSort
 )
+from coe.utils.format_utils import serialize_rows
+from coe.utils.instrumentation_utils import timed
+from coe.utils.query_budget_utils import QueryBudget
+from coe.utils.export_utils import ndjson_chunks, csv_chunks, gzip_chunks
+from coe.utils.http_utils import compute_etag, is_not_modified, not_modified_response
+from coe.utils.replica_utils import pinned_to_primary, reads_from_replica
 
 import math
 
 task_api = Namespace('Task', path="/task", description='Task related operations', decorators=[login_required])
 swagger_models = define_task_models(task_api)
 
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", ndjson_chunks),
+    "csv": ("text/csv", csv_chunks),
+}
+
+def parse_filters_and_sort(args):
+    filters_data = {
+        "status": args.get("status"),
+        "priority": args.get("priority"),
+        "search": args.get("search")
+    }
+
+    sort_data = {
+        "sort_by": args.get("sortBy"),
+        "sort_order": args.get("sortOrder")
+    }
+
+    filters = TaskFilters(**{key: value for key, value in filters_data.items() if value is not None})
+    sort = TaskSort(**{key: value for key, value in sort_data.items() if value is not None})
+    return filters, sort
+
+def run_async_service(fn, *args, **kwargs):
+    """Await an async_task_service function in its own session through Flask's async support."""
+    return current_app.ensure_sync(async_task_service.run_in_session)(fn, *args, **kwargs)
+
 @task_api.route("/add")
 class TaskCreate(Resource):
     @task_api.expect(swagger_models.create_task_request)
     @task_api.response(201, "Task Created", swagger_models.create_task_response)
     @task_api.response(401, "Unauthorized", swagger_models.error_response)
     @task_api.response(422, "Validation Error", swagger_models.error_response)
+    @QueryBudget(3)
     def post(self):
         try:
             task_data = CreateTaskRequestSchema.model_validate(request.json)
@@ -34,87 +72,290 @@ class TaskCreate(Resource):
             return {"detail": e.errors()}, 422
         
         current_user = get_current_user()
-        new_task = create_task(task_data, db.session, current_user)
+        if settings.TASK_ASYNC_ROUTES:
+            new_task = run_async_service(async_task_service.create_task, task_data, current_user=current_user)
+        else:
+            new_task = create_task(task_data, db.session, current_user)
         result = {"message": "Task created successfully", "task_id": new_task.id}
         
         response_object = CreateTaskResponseSchema.model_validate(result)
         return make_response(jsonify(response_object.model_dump(by_alias=True)), 201)
 
+@task_api.route("/bulk")
+class TaskBulk(Resource):
+    @task_api.expect(swagger_models.bulk_create_task_request)
+    @task_api.response(201, "Tasks Created", swagger_models.bulk_create_task_response)
+    @task_api.response(401, "Unauthorized", swagger_models.error_response)
+    @task_api.response(413, "Batch Too Large", swagger_models.error_response)
+    @task_api.response(422, "Validation Error", swagger_models.bulk_create_task_response)
+    @QueryBudget(3)
+    def post(self):
+        try:
+            bulk_data = BulkCreateTaskRequestSchema.model_validate(request.json)
+        except ValidationError as e:
+            return {"detail": e.errors()}, 422
+
+        max_batch_size = settings.TASK_BULK_MAX_BATCH_SIZE
+        if len(bulk_data.tasks) > max_batch_size:
+            return {"detail": f"At most {max_batch_size} tasks can be created per request"}, 413
+
+        valid_tasks, errors = [], []
+        for index, item in enumerate(bulk_data.tasks):
+            try:
+                valid_tasks.append((index, CreateTaskRequestSchema.model_validate(item)))
+            except ValidationError as e:
+                errors.append({"index": index, "detail": e.errors(include_url=False)})
+
+        missing_assignees = find_missing_users((task.assignee_id for _, task in valid_tasks if task.assignee_id), db.session)
+        if missing_assignees:
+            errors.extend({"index": index, "detail": "Assignee not found"} for index, task in valid_tasks if task.assignee_id in missing_assignees)
+            valid_tasks = [(index, task) for index, task in valid_tasks if task.assignee_id not in missing_assignees]
+            errors.sort(key=lambda error: error["index"])
+
+        current_user = get_current_user()
+        task_ids = bulk_create_tasks([task for _, task in valid_tasks], db.session, current_user)
+        result = {"message": f"{len(task_ids)} tasks created successfully", "task_ids": task_ids, "errors": errors}
+
+        response_object = BulkCreateTaskResponseSchema.model_validate(result)
+        status_code = 422 if errors and not task_ids else 201
+        return make_response(jsonify(response_object.model_dump(by_alias=True)), status_code)
+
+    @task_api.expect(swagger_models.bulk_update_task_request)
+    @task_api.response(200, "Success", swagger_models.bulk_change_task_response)
+    @task_api.response(401, "Unauthorized", swagger_models.error_response)
+    @task_api.response(422, "Validation Error", swagger_models.error_response)
+    @QueryBudget(3)
+    def put(self):
+        try:
+            bulk_data = BulkUpdateTaskRequestSchema.model_validate(request.json)
+            affected = bulk_update_tasks(bulk_data.patch, db.session, bulk_data.filters, bulk_data.ids, dry_run=bulk_data.dry_run)
+        except ValidationError as e:
+            return {"detail": e.errors()}, 422
+        except ValueError as e:
+            return {"detail": str(e)}, 422
+
+        message = f"{affected} tasks would be updated" if bulk_data.dry_run else f"{affected} tasks updated successfully"
+        result = {"message": message, "affected": affected, "dry_run": bulk_data.dry_run}
+        response_object = BulkChangeTaskResponseSchema.model_validate(result)
+        return make_response(jsonify(response_object.model_dump(by_alias=True)), 200)
+
+    @task_api.expect(swagger_models.bulk_delete_task_request)
+    @task_api.response(200, "Success", swagger_models.bulk_change_task_response)
+    @task_api.response(401, "Unauthorized", swagger_models.error_response)
+    @task_api.response(422, "Validation Error", swagger_models.error_response)
+    @QueryBudget(3)
+    def delete(self):
+        try:
+            bulk_data = BulkDeleteTaskRequestSchema.model_validate(request.json)
+            affected = bulk_remove_tasks(db.session, bulk_data.filters, bulk_data.ids, dry_run=bulk_data.dry_run)
+        except ValidationError as e:
+            return {"detail": e.errors()}, 422
+        except ValueError as e:
+            return {"detail": str(e)}, 422
+
+        message = f"{affected} tasks would be removed" if bulk_data.dry_run else f"{affected} tasks removed successfully"
+        result = {"message": message, "affected": affected, "dry_run": bulk_data.dry_run}
+        response_object = BulkChangeTaskResponseSchema.model_validate(result)
+        return make_response(jsonify(response_object.model_dump(by_alias=True)), 200)
+
 @task_api.route("/list")
 class TaskList(Resource):
     @task_api.param("page", "Page number (starts from 1)", type="integer", required=False)
     @task_api.param("recordsPerPage", "Number of items per page", type="integer", required=False)
+    @task_api.param("cursor", "Opaque cursor from a previous page's nextCursor/prevCursor; replaces page", type="string", required=False)
+    @task_api.param("withTotal", "Set to false to skip computing the total count", type="boolean", required=False)
+    @task_api.param("fields", "Comma-separated task fields to return, e.g. id,name,status (id is always included)", type="string", required=False)
+    @task_api.param("descriptionPreview", "Return at most this many characters of each description", type="integer", required=False)
     @task_api.param("status", "Filter by task status", type="string", required=False)
     @task_api.param("priority", "Filter by task priority", type="string", required=False)
     @task_api.param("search", "Search for task using name or description text", type="string", required=False)
-    @task_api.param("sortBy", "Sort result by field", type="string", required=False)
+    @task_api.param("sortBy", "Sort result by field (id, name, dueDate, startDate, priority, or relevance when searching)", type="string", required=False)
     @task_api.param("sortOrder", "Sorting Order", type="string", required=False)
     @task_api.response(200, "Success", swagger_models.get_task_list_response)
+    @task_api.response(304, "Not Modified")
     @task_api.response(422, "Validation Error", swagger_models.error_response)
+    @QueryBudget(5)
     def get(self):
         try:
             page = int(request.args.get("page", 1))
             limit = int(request.args.get("records_per_page", 10))
+            with_total = request.args.get("withTotal", "true").lower() not in ("false", "0")
 
-            filters_data = {
-                "status": request.args.get("status"),
-                "priority": request.args.get("priority"),
-                "search": request.args.get("search")
-            }
+            fields = request.args.get("fields")
+            fields = resolve_task_fields(fields.split(",")) if fields else None
+            description_preview = request.args.get("descriptionPreview")
+            description_preview = int(description_preview) if description_preview is not None else None
+            if description_preview is not None and description_preview < 0:
+                raise ValueError("descriptionPreview must not be negative")
 
-            sort_data = {
-                "sort_by": request.args.get("sortBy"),
-                "sort_order": request.args.get("sortOrder")
-            }
+            filters, sort = parse_filters_and_sort(request.args)
 
-            filters = TaskFilters(**{key: value for key, value in filters_data.items() if value is not None})
-            sort = TaskSort(**{key: value for key, value in sort_data.items() if value is not None})
+            cursor = request.args.get("cursor")
+            task_cursor = decode_task_cursor(cursor, sort) if cursor else None
 
         except (ValueError, ValidationError) as e:
             return {"detail": str(e)}, 422
 
+        # A cache hit is answered without touching the database; clients that
+        # must see their own writes skip the cache
+        cache_key = None
+        if not pinned_to_primary(db.session):
+            cache_key = task_list_cache_key(filters, sort, page, limit, cursor, with_total, fields, description_preview)
+        cached = get_cached_task_list(cache_key)
+        if cached is not None:
+            etag, body = cached
+            if is_not_modified(etag):
+                return not_modified_response(etag)
+
+            response = current_app.response_class(body, status=200, mimetype="application/json")
+            response.set_etag(etag)
+            return response
+
+        # A revalidation is answered from one aggregate, so an unchanged list costs
+        # no row loading and its count doubles as the exact total; plain requests skip it
+        etag = None
+        total = None
+        if request.if_none_match:
+            latest_update, matching = get_task_list_version(db.session, filters)
+            etag = compute_etag(latest_update, matching, sorted(request.args.items(multi=True)))
+            if is_not_modified(etag):
+                return not_modified_response(etag)
+            if with_total:
+                total = (matching, True)
+
         skip = (page - 1) * limit
-        tasks, total_records = get_tasks_list(db.session, filters, sort, skip=skip, limit=limit)
-        
-        result = {
-            "message": "Task fetched successfully",
-            "tasks": tasks,
-            "pagination": {
-                "page": page,
+        render_in_database = settings.TASK_LIST_RENDER_IN_DATABASE and not settings.TASK_ASYNC_ROUTES
+        if render_in_database:
+            task_page = fetch_task_page(db.session, filters, sort, skip=skip, limit=limit, cursor=task_cursor, as_json=True, fields=fields, description_preview=description_preview)
+            count = task_page.count
+            next_cursor, prev_cursor = build_page_cursors(task_page.first, task_page.last, count, sort, limit, task_cursor, has_previous=page > 1)
+        else:
+            if settings.TASK_ASYNC_ROUTES:
+                fetch_async = current_app.ensure_sync(async_task_service.fetch_task_page_and_count)
+                rows, async_total = fetch_async(filters, sort, skip=skip, limit=limit, cursor=task_cursor, with_total=with_total and total is None, fields=fields, description_preview=description_preview)
+                total = total or async_total
+            else:
+                rows = fetch_task_page(db.session, filters, sort, skip=skip, limit=limit, cursor=task_cursor, fields=fields, description_preview=description_preview)
+            count = len(rows)
+            next_cursor, prev_cursor = build_task_cursors(rows, sort, limit, task_cursor, has_previous=page > 1)
+
+        if total is None and with_total:
+            total = count_tasks(db.session, filters)
+        total_records, total_exact = total or (None, None)
+
+        with timed("serialize"):
+            # Rows go straight to JSON-ready dicts; only the small pagination block goes through pydantic
+            pagination = PaginationSchema.model_validate({
+                "page": None if task_cursor else page,
                 "limit": limit,
-                "count": len(tasks),
+                "count": count,
                 "total": total_records,
-                "total_pages": math.ceil(total_records / limit) if limit else 1
+                "total_type": None if total_records is None else ("exact" if total_exact else "estimated"),
+                "total_pages": None if total_records is None else (math.ceil(total_records / limit) if limit else 1),
+                "next_cursor": next_cursor,
+                "prev_cursor": prev_cursor
+            })
+
+            result = {
+                "message": "Task fetched successfully",
+                "pagination": pagination.model_dump(by_alias=True, mode="json")
             }
-        }
 
-        response_object = GetTaskListResponseSchema.model_validate(result)
-        return make_response(jsonify(response_object.model_dump(by_alias=True, mode="json")), 200)
+            if render_in_database:
+                # Splice Postgres' array in as-is; "tasks" sorts last, matching jsonify's key order
+                envelope = current_app.json.dumps(result, separators=(",", ":"))
+                body = f'{envelope[:-1]},"tasks":{task_page.tasks_json}}}\n'
+                response = current_app.response_class(body, status=200, mimetype="application/json")
+            else:
+                result["tasks"] = serialize_rows(rows, GetTaskResponseSchema, fields)
+                response = make_response(jsonify(result), 200)
+
+        # Without the aggregate the body is its own validator, and one handed out
+        # that way still revalidates once the request comes back conditional
+        body_etag = compute_etag(response.get_data(), sorted(request.args.items(multi=True)))
+        etag = etag or body_etag
+        response.set_etag(etag)
+        if not reads_from_replica(db.session):
+            # A lagging replica's answer would outlive the lag in the cache
+            cache_task_list(cache_key, etag, response.get_data())
+        if is_not_modified(body_etag):
+            return not_modified_response(etag)
+        return response
+
+
+@task_api.route("/export")
+class TaskExport(Resource):
+    @task_api.param("format", "Export format: ndjson (default) or csv", type="string", required=False)
+    @task_api.param("status", "Filter by task status", type="string", required=False)
+    @task_api.param("priority", "Filter by task priority", type="string", required=False)
+    @task_api.param("search", "Search for task using name or description text", type="string", required=False)
+    @task_api.param("sortBy", "Sort result by field (id, name, dueDate, startDate, priority, or relevance when searching)", type="string", required=False)
+    @task_api.param("sortOrder", "Sorting Order", type="string", required=False)
+    @task_api.response(200, "Success")
+    @task_api.response(401, "Unauthorized", swagger_models.error_response)
+    @task_api.response(422, "Validation Error", swagger_models.error_response)
+    def get(self):
+        export_format = request.args.get("format", "ndjson").lower()
+        if export_format not in EXPORT_FORMATS:
+            return {"detail": f"Unsupported export format, use one of: {', '.join(EXPORT_FORMATS)}"}, 422
+
+        try:
+            filters, sort = parse_filters_and_sort(request.args)
+        except (ValueError, ValidationError) as e:
+            return {"detail": str(e)}, 422
+
+        mimetype, encode = EXPORT_FORMATS[export_format]
+        batches = iter_task_batches(db.session, filters, sort, batch_size=settings.TASK_EXPORT_BATCH_SIZE)
+        chunks = encode(batches, GetTaskResponseSchema)
+
+        headers = {"Content-Disposition": f"attachment; filename=tasks.{export_format}", "Vary": "Accept-Encoding"}
+        if "gzip" in request.accept_encodings:
+            chunks = gzip_chunks(chunks)
+            headers["Content-Encoding"] = "gzip"
+
+        # stream_with_context keeps the request, and with it db.session, alive while the body is sent
+        return current_app.response_class(stream_with_context(chunks), mimetype=mimetype, headers=headers)
 
 
 @task_api.route("/<int:task_id>")
 class TaskGet(Resource):
     @task_api.response(200, "Success", swagger_models.get_task_response)
+    @task_api.response(304, "Not Modified")
     @task_api.response(404, "Not Found", swagger_models.error_response)
+    @QueryBudget(2)
     def get(self, task_id):
-        task = find_task_by_id(task_id, db.session)
+        if settings.TASK_ASYNC_ROUTES:
+            task = run_async_service(async_task_service.find_task_by_id, task_id)
+        else:
+            task = find_task_by_id(task_id, db.session)
         if not task:
             return {"detail": "Task not found"}, 404
 
-        response_object = GetTaskResponseSchema.model_validate(task)
-        return make_response(jsonify(response_object.model_dump(by_alias=True, mode="json")), 200)
+        etag = compute_etag(task.id, task.updated_on)
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+
+        with timed("serialize"):
+            response_object = GetTaskResponseSchema.model_validate(task)
+            response = make_response(jsonify(response_object.model_dump(by_alias=True, mode="json")), 200)
+        response.set_etag(etag)
+        return response
 
     @task_api.expect(swagger_models.update_task_request)
     @task_api.response(200, "Success", swagger_models.generic_response)
     @task_api.response(404, "Not Found", swagger_models.error_response)
     @task_api.response(422, "Validation Error", swagger_models.error_response)
+    @QueryBudget(3)
     def put(self, task_id):
         try:
             task_data = UpdateTaskRequestSchema.model_validate(request.json)
         except ValidationError as e:
             return {"detail": e.errors()}, 422
 
-        success = update_task_details(task_id, task_data, db.session)
+        if settings.TASK_ASYNC_ROUTES:
+            success = run_async_service(async_task_service.update_task_details, task_id, task_data)
+        else:
+            success = update_task_details(task_id, task_data, db.session)
         if not success:
             return {"detail": "Task not found"}, 404
 
@@ -124,8 +365,12 @@ class TaskGet(Resource):
 
     @task_api.response(200, "Success", swagger_models.generic_response)
     @task_api.response(404, "Not Found", swagger_models.error_response)
+    @QueryBudget(3)
     def delete(self, task_id):
-        success = remove_task(task_id, db.session)
+        if settings.TASK_ASYNC_ROUTES:
+            success = run_async_service(async_task_service.remove_task, task_id)
+        else:
+            success = remove_task(task_id, db.session)
         if not success:
             return {"detail": "Task not found"}, 404
 
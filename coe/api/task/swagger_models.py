@@ -9,11 +9,14 @@ def define_task_models(api):
     sort_order_enum = ['asc', 'desc']
 
     models.pagination = api.model('Pagination', {
-        'page': fields.Integer(required=True),
+        'page': fields.Integer(required=False),
         'limit': fields.Integer(required=True),
         'count': fields.Integer(required=True),
-        'total': fields.Integer(required=True),
-        'totalPages': fields.Integer(required=True, attribute='total_pages')
+        'total': fields.Integer(required=False),
+        'totalType': fields.String(enum=['exact', 'estimated'], required=False, attribute='total_type'),
+        'totalPages': fields.Integer(required=False, attribute='total_pages'),
+        'nextCursor': fields.String(required=False, attribute='next_cursor'),
+        'prevCursor': fields.String(required=False, attribute='prev_cursor')
     })
 
     models.get_tasks = api.model('GetTasks', {
@@ -48,6 +51,43 @@ def define_task_models(api):
         'taskId': fields.Integer(attribute='task_id')
     })
 
+    models.bulk_create_task_request = api.model('BulkCreateTaskRequest', {
+        'tasks': fields.List(fields.Nested(models.create_task_request), required=True)
+    })
+
+    models.bulk_task_error = api.model('BulkTaskError', {
+        'index': fields.Integer(description="Position of the item in the request"),
+        'detail': fields.Raw(description="Why the item was rejected")
+    })
+
+    models.bulk_create_task_response = api.model('BulkCreateTaskResponse', {
+        'message': fields.String(),
+        'taskIds': fields.List(fields.Integer, attribute='task_ids'),
+        'errors': fields.List(fields.Nested(models.bulk_task_error))
+    })
+
+    models.task_filters = api.model('TaskFilters', {
+        'status': fields.String(enum=status_enum, required=False),
+        'priority': fields.String(enum=priority_enum, required=False),
+        'search': fields.String(required=False)
+    })
+
+    models.bulk_delete_task_request = api.model('BulkDeleteTaskRequest', {
+        'ids': fields.List(fields.Integer, required=False, description="Only tasks with these ids"),
+        'filters': fields.Nested(models.task_filters, required=False, description="Only tasks matching these filters"),
+        'dryRun': fields.Boolean(required=False, attribute='dry_run', description="Report the affected count without writing")
+    })
+
+    models.bulk_update_task_request = api.inherit('BulkUpdateTaskRequest', models.bulk_delete_task_request, {
+        'patch': fields.Nested(models.update_task_request, required=True)
+    })
+
+    models.bulk_change_task_response = api.model('BulkChangeTaskResponse', {
+        'message': fields.String(),
+        'affected': fields.Integer(),
+        'dryRun': fields.Boolean(attribute='dry_run')
+    })
+
     models.generic_response = api.model('GenericResponse', {
         'message': fields.String()
     })
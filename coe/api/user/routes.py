@@ -1,13 +1,13 @@
 from flask import request, make_response, jsonify
 from flask_restx import Namespace, Resource
 from pydantic import ValidationError
-from coe.services.auth_service import create_access_token, get_current_user, login_required
+from coe.services.auth_service import create_access_token, decode_token_claims, get_current_user, login_required
 from coe.services.user_service import login_user, create_user, remove_user, update_user
 from config import Config as settings
 from coe.models.base import db
 from coe.schemas.user import UserLogin, UserLoginResponse, RefreshTokenResponse, UserRegisterResponse, CreateUser, UserLogoutResponse, UserDeleteResponse, UpdateUser, UserUpdateResponse, LoggedInUserResponse
 from coe.api.user.swagger_models import define_user_models
-from jose import JWTError, jwt
+from jose import JWTError
 
 user_api = Namespace('User', description='User related operations', path='user')
 
@@ -73,7 +73,7 @@ class RefreshAccessToken(Resource):
             return {"detail": "Missing refresh token"}, 401
 
         try:
-            payload = jwt.decode(refresh_token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+            payload = decode_token_claims(refresh_token)
             if payload.get("type") != "refresh":
                 return {"detail": "Invalid refresh token"}, 403
 
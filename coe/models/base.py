@@ -1,9 +1,10 @@
 from sqlalchemy import Column, DateTime, func
 from flask_sqlalchemy import SQLAlchemy
 from coe.utils.format_utils import to_camel
+from coe.utils.replica_utils import RoutingSession
 from pydantic import BaseModel
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 
 class TimestampMixin:
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
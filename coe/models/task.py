@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum, Date, text
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum, Date, Index, text, func, literal_column
 from sqlalchemy.orm import relationship
 from .base import db, TimestampMixin
 import enum
@@ -13,6 +13,12 @@ class StatusEnum(enum.Enum):
     in_progress = "in_progress"
     completed = "completed"
 
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+
+def search_document(name, description):
+    # Kept identical to the ix_tasks_search_document expression so Postgres can use the index
+    return func.to_tsvector(SEARCH_CONFIG, name + literal_column("' '") + description)
+
 class Task(db.Model, TimestampMixin):
     __tablename__ = "tasks"
 
@@ -28,3 +34,20 @@ class Task(db.Model, TimestampMixin):
 
     assignee = relationship("User", back_populates="tasks", foreign_keys=[assignee_id], passive_deletes=True)
     created_by = relationship("User", back_populates="created_tasks", foreign_keys=[created_by_id], passive_deletes=True)
+
+    __table_args__ = (
+        Index("ix_tasks_search_document", search_document(name, description), postgresql_using="gin"),
+        Index("ix_tasks_name_trgm", func.lower(name).label("lower_name"), postgresql_using="gin", postgresql_ops={"lower_name": "gin_trgm_ops"}),
+        Index("ix_tasks_description_trgm", func.lower(description).label("lower_description"), postgresql_using="gin", postgresql_ops={"lower_description": "gin_trgm_ops"}),
+        Index("ix_tasks_status_due_date_id", status, due_date, id),
+        Index("ix_tasks_status_start_date_id", status, start_date, id),
+        Index("ix_tasks_status_priority_id", status, priority, id),
+        Index("ix_tasks_status_name_id", status, name, id),
+        Index("ix_tasks_priority_due_date_id", priority, due_date, id),
+        Index("ix_tasks_due_date_id", due_date, id),
+        Index("ix_tasks_start_date_id", start_date, id),
+        Index("ix_tasks_priority_id", priority, id),
+        Index("ix_tasks_name_id", name, id),
+        Index("ix_tasks_open_due_date_id", due_date, id, postgresql_where=text("status <> 'completed'")),
+        Index("ix_tasks_open_priority_due_date_id", priority, due_date, id, postgresql_where=text("status <> 'completed'")),
+    )
@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import Any, List, Optional
+from coe.models.base import CamelModel
+
+class SlowQuery(CamelModel):
+    id: int
+    recorded_at: datetime
+    duration_ms: float
+    statement: str
+    parameters: Any = None
+    route: Optional[str] = None
+    plan: Any = None
+    plan_status: str
+
+class SlowQueryListResponse(CamelModel):
+    enabled: bool
+    threshold_ms: Optional[float] = None
+    queries: List[SlowQuery]
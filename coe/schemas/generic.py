@@ -1,4 +1,20 @@
+from typing import Literal, Optional
 from coe.models.base import CamelModel
 
 class HelloResponse(CamelModel):
-    message: str
\ No newline at end of file
+    message: str
+
+class PoolStatus(CamelModel):
+    pool_class: str
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    capacity: int
+    utilization: float
+
+class DBHealthResponse(CamelModel):
+    status: Literal["ok", "unavailable"]
+    latency_ms: Optional[float] = None
+    detail: Optional[str] = None
+    pool: PoolStatus
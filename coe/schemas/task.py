@@ -1,6 +1,6 @@
 from pydantic import Field, constr, conint, field_validator
 from coe.models.base import CamelModel
-from typing import Optional, List, Literal
+from typing import Optional, List, Literal, Union, Any
 from enum import Enum
 from datetime import date, datetime
 
@@ -20,11 +20,14 @@ class StatusEnum(str, Enum):
     completed = "completed"
 
 class PaginationSchema(CamelModel):
-    page: int
+    page: Optional[int] = None
     limit: int
     count: int
-    total: int
-    total_pages: int
+    total: Optional[int] = None
+    total_type: Optional[Literal["exact", "estimated"]] = None
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
 ### Request Schemas
 
@@ -40,6 +43,13 @@ class TaskSort(CamelModel):
 class TaskListRequestSchema(TaskFilters, TaskSort):
     pass
 
+class TaskCursor(CamelModel):
+    sort_by: str
+    sort_order: Literal["asc", "desc"]
+    value: Optional[Union[int, str]] = None
+    id: int
+    direction: Literal["next", "prev"]
+
 class CreateTaskRequestSchema(CamelModel):
     name: NameStr = Field(..., description="First name of the task")
     description: str = Field(..., description="Description of the task")
@@ -65,11 +75,39 @@ class UpdateTaskRequestSchema(CamelModel):
             raise ValueError(f"{field.field_name} cannot be null")
         return value
 
+class BulkCreateTaskRequestSchema(CamelModel):
+    tasks: List[Any]
+
+class TaskSelectionSchema(CamelModel):
+    ids: Optional[List[ID]] = None
+    filters: TaskFilters = Field(default_factory=TaskFilters)
+    dry_run: bool = False
+
+class BulkUpdateTaskRequestSchema(TaskSelectionSchema):
+    patch: UpdateTaskRequestSchema
+
+class BulkDeleteTaskRequestSchema(TaskSelectionSchema):
+    pass
+
 ### Response Schemas
 class CreateTaskResponseSchema(CamelModel):
     message: str
     task_id: int
 
+class BulkTaskErrorSchema(CamelModel):
+    index: int
+    detail: Any
+
+class BulkCreateTaskResponseSchema(CamelModel):
+    message: str
+    task_ids: List[int]
+    errors: List[BulkTaskErrorSchema]
+
+class BulkChangeTaskResponseSchema(CamelModel):
+    message: str
+    affected: int
+    dry_run: bool
+
 class UpdateTaskResponseSchema(CamelModel):
     message: str
 
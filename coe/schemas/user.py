@@ -28,6 +28,12 @@ class UserLogin(CamelModel):
 class RefreshToken(CamelModel):
     refresh_token: str
 
+class UserPrincipal(CamelModel):
+    id: int
+    first_name: str
+    last_name: str
+    email: str
+
 ### Response Schemas
 class RefreshTokenResponse(CamelModel):
     access_token: str
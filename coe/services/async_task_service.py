@@ -0,0 +1,144 @@
+import asyncio
+import threading
+from typing import Tuple, Optional
+from sqlalchemy import select, update, delete
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
+from coe.models.task import Task
+from coe.schemas.task import CreateTaskRequestSchema, UpdateTaskRequestSchema, TaskFilters, TaskSort, TaskCursor
+from coe.schemas.user import UserPrincipal
+from coe.services.task_service import (
+    build_task_page_query, build_task_count_query, invalidate_task_caches,
+    task_count_cache_key, get_cached_task_count, cache_task_count, task_list_columns
+)
+from coe.utils.replica_utils import pinned_to_primary
+from coe.utils.sql_utils import get_dialect_name, set_local_statement_timeout
+from config import Config as settings
+
+
+def build_async_connect_args() -> dict:
+    if settings.DB_PGBOUNCER_MODE:
+        # Transaction pooling can hand each statement to a different server connection,
+        # so neither asyncpg nor SQLAlchemy may keep prepared statements around
+        return {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        return {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+    return {}
+
+# Flask runs each async view on its own short-lived event loop, and asyncpg
+# connections cannot outlive the loop that opened them, so nothing is pooled here.
+async_engine = create_async_engine(settings.ASYNC_DATABASE_URI, poolclass=NullPool, connect_args=build_async_connect_args())
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+# Without a pool nothing else caps the connections; this stands in for the
+# pool size. A threading semaphore because every view has an event loop of its own.
+_connection_slots = threading.BoundedSemaphore(max(settings.DB_POOL_SIZE, 1))
+
+
+async def run_in_session(fn, *args, **kwargs):
+    """Await `fn(*args, db=<new AsyncSession>, **kwargs)` and close the session afterwards.
+
+    At most DB_POOL_SIZE sessions per process are open at once; waiting longer
+    than DB_POOL_TIMEOUT for one raises sqlalchemy's TimeoutError, as the sync
+    pool does.
+    """
+    if not await asyncio.to_thread(_connection_slots.acquire, timeout=settings.DB_POOL_TIMEOUT):
+        raise PoolTimeoutError(f"No async database connection free within {settings.DB_POOL_TIMEOUT}s")
+
+    try:
+        async with AsyncSessionLocal() as db:
+            if settings.DB_PGBOUNCER_MODE and settings.DB_STATEMENT_TIMEOUT_MS > 0:
+                set_local_statement_timeout(db.sync_session, settings.DB_STATEMENT_TIMEOUT_MS)
+            return await fn(*args, db=db, **kwargs)
+    finally:
+        _connection_slots.release()
+
+
+async def create_task(task_data: CreateTaskRequestSchema, db: AsyncSession, current_user: UserPrincipal) -> Task:
+    db_task = Task(
+        name=task_data.name,
+        description=task_data.description,
+        created_by_id=current_user.id,
+        assignee_id=task_data.assignee_id,
+        due_date=task_data.due_date,
+        start_date=task_data.start_date,
+        priority=task_data.priority
+    )
+    db.add(db_task)
+    await db.commit()
+    await db.refresh(db_task)
+    invalidate_task_caches()
+
+    return db_task
+
+
+async def find_task_by_id(task_id: int, db: AsyncSession) -> Optional[Task]:
+    return await db.scalar(select(Task).where(Task.id == task_id))
+
+
+async def get_tasks_list(db: AsyncSession, filters: TaskFilters, sort: TaskSort, skip: int = 0, limit: int = 10, cursor: Optional[TaskCursor] = None, with_total: bool = True, columns: Optional[tuple] = None) -> Tuple[list, Optional[int]]:
+    dialect_name = get_dialect_name(db)
+    total = await db.scalar(build_task_count_query(filters, dialect_name)) if with_total else None
+
+    statement, _ = build_task_page_query(filters, sort, dialect_name, skip, limit, cursor, columns)
+    result = await db.execute(statement)
+    tasks = list(result.all() if columns else result.scalars().all())
+    if cursor is not None and cursor.direction == "prev":
+        tasks.reverse()
+
+    return (tasks, total)
+
+
+async def count_tasks(db: AsyncSession, filters: TaskFilters) -> Tuple[int, bool]:
+    """Exact filtered total, sharing task_service's count cache."""
+    if pinned_to_primary(db):
+        return (await db.scalar(build_task_count_query(filters, get_dialect_name(db))), True)
+
+    cache_key = task_count_cache_key(filters)
+    cached = get_cached_task_count(cache_key)
+    if cached is not None:
+        return cached
+
+    result = (await db.scalar(build_task_count_query(filters, get_dialect_name(db))), True)
+    cache_task_count(cache_key, result)
+    return result
+
+
+async def fetch_task_page_and_count(filters: TaskFilters, sort: TaskSort, skip: int = 0, limit: int = 10, cursor: Optional[TaskCursor] = None, with_total: bool = True, fields: Optional[Tuple[str, ...]] = None, description_preview: Optional[int] = None) -> Tuple[list, Optional[Tuple[int, bool]]]:
+    """The list route's rows and (total, is_exact), queried concurrently on two connections."""
+    columns = task_list_columns(sort, fields, description_preview)
+    page = run_in_session(get_tasks_list, filters=filters, sort=sort, skip=skip, limit=limit, cursor=cursor, with_total=False, columns=columns)
+    if not with_total:
+        rows, _ = await page
+        return (rows, None)
+
+    (rows, _), total = await asyncio.gather(page, run_in_session(count_tasks, filters=filters))
+    return (rows, total)
+
+
+async def update_task_details(task_id: int, task_data: UpdateTaskRequestSchema, db: AsyncSession) -> bool:
+    update_fields = task_data.model_dump(exclude_unset=True, exclude={"id"})
+    if update_fields:
+        statement = update(Task).where(Task.id == task_id).values(**update_fields).returning(Task.id).execution_options(synchronize_session=False)
+    else:
+        statement = select(Task.id).where(Task.id == task_id)
+
+    if (await db.execute(statement)).scalar() is None:
+        return False
+
+    await db.commit()
+    invalidate_task_caches()
+
+    return True
+
+
+async def remove_task(task_id: int, db: AsyncSession) -> bool:
+    statement = delete(Task).where(Task.id == task_id).returning(Task.id).execution_options(synchronize_session=False)
+    if (await db.execute(statement)).scalar() is None:
+        return False
+
+    await db.commit()
+    invalidate_task_caches()
+
+    return True
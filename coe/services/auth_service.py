@@ -1,17 +1,28 @@
 from datetime import datetime, timedelta
 from jose import jwt
+import hashlib
+import time
 from functools import wraps
-from flask import request
-from werkzeug.exceptions import Unauthorized
+from flask import request, g, has_app_context
+from werkzeug.exceptions import Unauthorized, Forbidden
 from coe.models import User
 from jose import JWTError
 from coe.models.base import db
+from coe.schemas.user import UserPrincipal
+from coe.utils.cache_utils import TTLCache
+from coe.utils.replica_utils import read_only
 from config import Config as settings
 
 SECRET_KEY = settings.JWT_SECRET_KEY
 ALGORITHM = settings.JWT_ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
+# Verified claims by token digest, each kept until the token's own exp
+token_cache = TTLCache(max_size=settings.TOKEN_CACHE_MAX_SIZE, name="token")
+
+# Resolved principals by user id, shared across requests; disabled when USER_CACHE_MAX_SIZE is 0
+user_cache = TTLCache(max_size=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS, name="user")
+
 
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -27,31 +38,75 @@ def create_refresh_token(data: dict):
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+def decode_token_claims(token: str) -> dict:
+    digest = hashlib.sha256(token.encode("utf-8")).digest()
+    claims = token_cache.get(digest)
+
+    if claims is None:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        expires_in = claims.get("exp", 0) - time.time()
+        if expires_in > 0:
+            token_cache.set(digest, claims, ttl=expires_in)
+
+    return dict(claims)
+
+
 def decode_token(token: str):
-    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    payload = decode_token_claims(token)
     user_id: int = payload.get("user_id")
     return user_id
 
 
-def get_current_user():
+def get_token_cache_stats() -> dict:
+    return token_cache.stats()
+
+
+@read_only
+def get_current_user() -> UserPrincipal:
     access_token = request.cookies.get("access_token")
     if not access_token:
         raise Unauthorized("Not authenticated")
 
+    # login_required and the handler both ask for the user; resolve it once per request
+    if g.get("current_user_token") == access_token:
+        return g.current_user
+
     try:
         user_id = decode_token(access_token)
     except Exception:
         raise Unauthorized("Invalid or expired token")
 
-    user = db.session.query(User).filter_by(id=user_id).first()
-    if not user:
-        raise Unauthorized("User not found")
+    user = user_cache.get(user_id)
+    if user is None:
+        db_user = db.session.query(User).filter_by(id=user_id).first()
+        if not db_user:
+            raise Unauthorized("User not found")
 
+        user = UserPrincipal.model_validate(db_user)
+        user_cache.set(user_id, user)
+
+    g.current_user = user
+    g.current_user_token = access_token
     return user
 
+def evict_cached_user(user_id: int):
+    user_cache.delete(user_id)
+
+    if has_app_context() and "current_user" in g and g.current_user.id == user_id:
+        g.pop("current_user")
+        g.pop("current_user_token")
+
 def login_required(fn):
     @wraps(fn)
     def wrapper(*args, **kwargs):
         get_current_user()
         return fn(*args, **kwargs)
     return wrapper
+
+def admin_required(fn):
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if get_current_user().email.lower() not in settings.ADMIN_EMAILS:
+            raise Forbidden("Admin access required")
+        return fn(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,24 @@
+import time
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from coe.utils.sql_utils import get_pool_status
+from config import Config as settings
+
+
+def check_db_health(db: Session, engine) -> dict:
+    started = time.perf_counter()
+    try:
+        db.execute(text("SELECT 1"))
+        status, detail = "ok", None
+    except SQLAlchemyError as e:
+        db.rollback()
+        status, detail = "unavailable", type(e).__name__
+    latency_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    return {
+        "status": status,
+        "latency_ms": latency_ms if status == "ok" else None,
+        "detail": detail,
+        "pool": get_pool_status(engine, settings.DB_MAX_OVERFLOW)
+    }
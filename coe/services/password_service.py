@@ -0,0 +1,105 @@
+import multiprocessing
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import bcrypt
+from werkzeug.exceptions import ServiceUnavailable
+from coe.utils.instrumentation_utils import record_timing
+from coe.utils.metrics_utils import observe_bcrypt
+from config import Config as settings
+
+
+def _hash(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+
+
+def _check(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+class HashingPool:
+    """Runs bcrypt in worker processes so request threads only wait on it.
+
+    At most `workers + queue_size` jobs are admitted at once; beyond that, or
+    when a job outlives `timeout`, callers get a 503 instead of queueing up.
+    With `workers` set to 0 hashing runs inline.
+    """
+
+    def __init__(self, workers: int, queue_size: int, timeout: float):
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(workers + queue_size, 1))
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Forking a threaded server can copy locks held by other threads into the workers
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("forkserver"))
+            return self._executor
+
+    def _reset_executor(self):
+        with self._lock:
+            self._executor = None
+
+    def run(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)
+
+        if not self._slots.acquire(blocking=False):
+            raise ServiceUnavailable("Password hashing is saturated, please retry shortly")
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BrokenProcessPool:
+            self._slots.release()
+            self._reset_executor()
+            raise ServiceUnavailable("Password hashing is unavailable, please retry shortly")
+
+        # The slot is held until the job really finishes, even if this caller gives up
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise ServiceUnavailable("Password hashing timed out, please retry shortly")
+        except BrokenProcessPool:
+            self._reset_executor()
+            raise ServiceUnavailable("Password hashing is unavailable, please retry shortly")
+
+
+hashing_pool = HashingPool(
+    workers=settings.HASHING_POOL_WORKERS,
+    queue_size=settings.HASHING_QUEUE_SIZE,
+    timeout=settings.HASHING_TIMEOUT_SECONDS
+)
+
+
+@contextmanager
+def _measure(operation: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        record_timing("bcrypt", elapsed)
+        observe_bcrypt(operation, elapsed)
+
+
+def hash_password(password: str) -> str:
+    with _measure("hash"):
+        return hashing_pool.run(_hash, password.encode('utf-8'), settings.BCRYPT_ROUNDS).decode('utf-8')
+
+
+def verify_password(password: str, hashed_password: str) -> bool:
+    with _measure("verify"):
+        return hashing_pool.run(_check, password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    # bcrypt hashes look like $2b$<cost>$<salt+digest>
+    return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
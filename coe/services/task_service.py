@@ -1,9 +1,65 @@
 from sqlalchemy.orm import Session
-from coe.models.task import Task
+from coe.models.task import Task, SEARCH_CONFIG, search_document
 from coe.models.user import User
-from coe.schemas.task import CreateTaskRequestSchema, UpdateTaskRequestSchema, TaskFilters, TaskSort
-from typing import List, Tuple
-from sqlalchemy import or_, func, asc, desc
+from coe.models.base import db as _db
+from coe.schemas.task import CreateTaskRequestSchema, UpdateTaskRequestSchema, GetTaskResponseSchema, TaskFilters, TaskSort, TaskCursor
+from coe.utils.cursor_utils import encode_cursor, decode_cursor
+from coe.utils.cache_utils import GenerationalCache, build_cache_backend
+from coe.utils.sql_utils import get_dialect_name, estimate_row_count, json_timestamp, indexes_exist
+from coe.utils.format_utils import schema_field_map
+from coe.utils.concurrency_utils import SingleFlight
+from coe.utils.replica_utils import read_only, pinned_to_primary, reads_from_replica
+from config import Config as settings
+from typing import List, Tuple, Optional, Set, Iterable, Iterator, NamedTuple
+from sqlalchemy import or_, and_, func, asc, desc, tuple_, case, insert, select, update, delete, literal, cast, Text, DateTime
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.sql import Select
+from types import SimpleNamespace
+from datetime import date, datetime
+import enum
+
+# Define allowed fields to prevent SQL injection
+ALLOWED_SORT_FIELDS = {
+    "id": Task.id,
+    "name": Task.name,
+    "dueDate": Task.due_date,
+    "startDate": Task.start_date,
+    "priority": Task.priority,
+}
+RELEVANCE_SORT = "relevance"
+TRIGRAM_INDEXES = ("ix_tasks_name_trgm", "ix_tasks_description_trgm")
+_trigram_search = None
+
+# Columns backing GetTaskResponseSchema, in field order, for serialize_rows()
+TASK_RESPONSE_FIELDS = tuple(name for name, _ in schema_field_map(GetTaskResponseSchema))
+TASK_RESPONSE_COLUMNS = tuple(getattr(Task, name) for name in TASK_RESPONSE_FIELDS)
+
+# Filtered totals keyed by normalize_filters(); a task write anywhere bumps the generation
+_task_count_backend = build_cache_backend(
+    settings.TASK_COUNT_CACHE_BACKEND,
+    max_size=settings.TASK_COUNT_CACHE_MAX_SIZE,
+    ttl=settings.TASK_COUNT_CACHE_TTL_SECONDS,
+    redis_url=settings.REDIS_URL
+)
+task_count_cache = GenerationalCache(_task_count_backend, "task-count", ttl=settings.TASK_COUNT_CACHE_TTL_SECONDS) if _task_count_backend else None
+
+# Finished /task/list response bodies; a task write anywhere bumps the generation
+_task_list_backend = build_cache_backend(
+    settings.TASK_LIST_CACHE_BACKEND,
+    max_size=settings.TASK_LIST_CACHE_MAX_SIZE,
+    ttl=settings.TASK_LIST_CACHE_TTL_SECONDS,
+    redis_url=settings.REDIS_URL
+)
+task_list_cache = GenerationalCache(_task_list_backend, "task-list", ttl=settings.TASK_LIST_CACHE_TTL_SECONDS) if _task_list_backend else None
+
+# Identical list and count queries running at the same moment share one execution
+task_query_flight = SingleFlight(timeout=settings.TASK_QUERY_COALESCE_TIMEOUT_SECONDS, name="task-query")
+
+def invalidate_task_caches():
+    if task_count_cache is not None:
+        task_count_cache.invalidate()
+    if task_list_cache is not None:
+        task_list_cache.invalidate()
 
 def create_task(task_data: CreateTaskRequestSchema, db: Session, current_user: User) -> Task:
     db_task = Task(
@@ -18,82 +74,530 @@ def create_task(task_data: CreateTaskRequestSchema, db: Session, current_user: U
     db.add(db_task)
     db.commit()
     db.refresh(db_task)
+    invalidate_task_caches()
     
     return db_task
 
+def bulk_create_tasks(tasks_data: List[CreateTaskRequestSchema], db: Session, current_user: User) -> List[int]:
+    rows = []
+    for task_data in tasks_data:
+        row = task_data.model_dump(exclude={"priority"})
+        row["created_by_id"] = current_user.id
+        if task_data.priority is not None:
+            row["priority"] = task_data.priority.value
+        rows.append(row)
+
+    if not rows:
+        return []
+
+    # One multi-row INSERT ... RETURNING per batch of rows sharing the same keys
+    statement = insert(Task).returning(Task.id, sort_by_parameter_order=True)
+    task_ids = list(db.scalars(statement, rows))
+    db.commit()
+    invalidate_task_caches()
+
+    return task_ids
+
+def find_missing_users(user_ids: Iterable[int], db: Session) -> Set[int]:
+    user_ids = set(user_ids)
+    if not user_ids:
+        return set()
+
+    existing = db.scalars(select(User.id).where(User.id.in_(user_ids)))
+    return user_ids - set(existing)
+
+@read_only
 def find_task_by_id(task_id: int, db: Session) -> Task:
     return db.query(Task).filter(Task.id == task_id).first()
 
-def apply_task_filters(queryset, filters: TaskFilters):
+def normalize_filters(filters: TaskFilters) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    return (
+        filters.status.lower() if filters.status else None,
+        filters.priority.lower() if filters.priority else None,
+        filters.search.lower() if filters.search else None,
+    )
+
+def task_filter_conditions(filters: TaskFilters, dialect_name: str) -> list:
+    conditions = []
     if filters.status:
-        queryset = queryset.filter(Task.status == filters.status.lower())
+        conditions.append(Task.status == filters.status.lower())
 
     if filters.priority:
-        queryset = queryset.filter(Task.priority == filters.priority.lower())
+        conditions.append(Task.priority == filters.priority.lower())
 
     if filters.search:
-        search_term = f"%{filters.search.lower()}%"
-        queryset = queryset.filter(
-            or_(
-                func.lower(Task.name).like(search_term),
-                func.lower(Task.description).like(search_term)
-            )
-        )
-
-    return queryset
-
-def apply_sorting(queryset, sort_by: str, sort_order: str):
-    # Define allowed fields to prevent SQL injection
-    allowed_sort_fields = {
-        "id": Task.id,
-        "name": Task.name,
-        "dueDate": Task.due_date,
-        "startDate": Task.start_date,
-        "priority": Task.priority,
-    }
-
-    sort_column = allowed_sort_fields.get(sort_by)
-    if sort_column is not None:
-        if sort_order == "desc":
-            queryset = queryset.order_by(desc(sort_column))
+        conditions.append(search_condition(filters.search, dialect_name))
+
+    return conditions
+
+def apply_task_filters(queryset, filters: TaskFilters):
+    conditions = task_filter_conditions(filters, get_dialect_name(queryset.session))
+    return queryset.filter(*conditions) if conditions else queryset
+
+def trigram_search_available() -> bool:
+    """Whether the pg_trgm indexes were created by the migrations; looked up once per process."""
+    global _trigram_search
+    if _trigram_search is None:
+        with _db.engine.connect() as connection:
+            _trigram_search = indexes_exist(connection, *TRIGRAM_INDEXES)
+    return _trigram_search
+
+def search_condition(search: str, dialect_name: str):
+    search_term = f"%{search.lower()}%"
+    substring_match = or_(
+        func.lower(Task.name).like(search_term),
+        func.lower(Task.description).like(search_term)
+    )
+
+    if dialect_name != "postgresql":
+        return substring_match
+
+    full_text_match = search_document(Task.name, Task.description).op("@@")(func.websearch_to_tsquery(SEARCH_CONFIG, search))
+
+    # Without the pg_trgm indexes the LIKE branch can only be answered by a
+    # sequential scan that computes to_tsvector for every row, so it is left out
+    if not trigram_search_available():
+        return full_text_match
+
+    # Both branches are backed by a GIN index (tsvector and pg_trgm), so Postgres can BitmapOr them
+    return or_(full_text_match, substring_match)
+
+def search_rank(search: str, dialect_name: str):
+    if dialect_name != "postgresql":
+        return case((func.lower(Task.name).like(f"%{search.lower()}%"), 1), else_=0)
+
+    return func.ts_rank(search_document(Task.name, Task.description), func.websearch_to_tsquery(SEARCH_CONFIG, search))
+
+def normalize_sort(sort: TaskSort) -> Tuple[str, str]:
+    if sort.sort_by == RELEVANCE_SORT:
+        return RELEVANCE_SORT, "asc" if sort.sort_order == "asc" else "desc"
+
+    sort_by = sort.sort_by if sort.sort_by in ALLOWED_SORT_FIELDS else "id"
+    sort_order = "desc" if sort.sort_order == "desc" else "asc"
+    return sort_by, sort_order
+
+def task_order_by(sort_by: str, sort_order: str, dialect_name: str, search: Optional[str] = None) -> list:
+    if sort_by == RELEVANCE_SORT and search:
+        sort_column = search_rank(search, dialect_name)
+    else:
+        sort_column = ALLOWED_SORT_FIELDS.get(sort_by, Task.id)
+    nullable = getattr(sort_column, "nullable", False)
+
+    # Nulls are pinned to Postgres' default placement so that keyset predicates
+    # and btree index scans agree on the order; Task.id breaks ties.
+    if sort_order == "desc":
+        order_by = [desc(sort_column).nulls_first() if nullable else desc(sort_column)]
+        tie_breaker = desc(Task.id)
+    else:
+        order_by = [asc(sort_column).nulls_last() if nullable else asc(sort_column)]
+        tie_breaker = asc(Task.id)
+
+    if sort_column is not Task.id:
+        order_by.append(tie_breaker)
+
+    return order_by
+
+def apply_sorting(queryset, sort_by: str, sort_order: str, search: Optional[str] = None):
+    return queryset.order_by(*task_order_by(sort_by, sort_order, get_dialect_name(queryset.session), search))
+
+def keyset_sort(cursor: TaskCursor) -> Tuple[str, str]:
+    """The (sort_by, sort_order) a keyset page is fetched in; `prev` pages run backwards."""
+    descending = (cursor.sort_order == "desc") != (cursor.direction == "prev")
+    return cursor.sort_by, "desc" if descending else "asc"
+
+def keyset_condition(cursor: TaskCursor):
+    """WHERE clause selecting the rows after `cursor` in its fetch order (see keyset_sort)."""
+    sort_column = ALLOWED_SORT_FIELDS[cursor.sort_by]
+    value = parse_cursor_value(sort_column, cursor.value)
+    descending = keyset_sort(cursor)[1] == "desc"
+
+    if sort_column is Task.id:
+        return Task.id < cursor.id if descending else Task.id > cursor.id
+
+    if value is None:
+        # The cursor row sits in the null block, which comes last ascending and first descending
+        if descending:
+            return or_(and_(sort_column.is_(None), Task.id < cursor.id), sort_column.is_not(None))
+        return and_(sort_column.is_(None), Task.id > cursor.id)
+
+    if descending:
+        return tuple_(sort_column, Task.id) < (value, cursor.id)
+
+    condition = tuple_(sort_column, Task.id) > (value, cursor.id)
+    if sort_column.nullable:
+        condition = or_(condition, sort_column.is_(None))
+    return condition
+
+def apply_keyset(queryset, cursor: TaskCursor):
+    sort_by, sort_order = keyset_sort(cursor)
+    return apply_sorting(queryset.filter(keyset_condition(cursor)), sort_by, sort_order)
+
+def parse_cursor_value(sort_column, value):
+    if value is None:
+        return None
+
+    python_type = sort_column.type.python_type
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+def encode_task_cursor(task: Task, sort: TaskSort, direction: str) -> str:
+    sort_by, sort_order = normalize_sort(sort)
+    value = getattr(task, ALLOWED_SORT_FIELDS[sort_by].key)
+    if isinstance(value, date):
+        value = value.isoformat()
+    elif isinstance(value, enum.Enum):
+        value = value.value
+
+    cursor = TaskCursor(sort_by=sort_by, sort_order=sort_order, value=value, id=task.id, direction=direction)
+    return encode_cursor(cursor.model_dump(by_alias=True))
+
+def decode_task_cursor(cursor: str, sort: TaskSort) -> TaskCursor:
+    task_cursor = TaskCursor.model_validate(decode_cursor(cursor))
+    if task_cursor.sort_by not in ALLOWED_SORT_FIELDS:
+        raise ValueError("Invalid cursor")
+    if (task_cursor.sort_by, task_cursor.sort_order) != normalize_sort(sort):
+        raise ValueError("Cursor does not match the requested sort")
+
+    try:
+        parse_cursor_value(ALLOWED_SORT_FIELDS[task_cursor.sort_by], task_cursor.value)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+    return task_cursor
+
+def build_task_cursors(tasks: List[Task], sort: TaskSort, limit: int, cursor: Optional[TaskCursor] = None, has_previous: bool = False) -> Tuple[Optional[str], Optional[str]]:
+    """Return the (next, prev) cursors for a page that was fetched with `cursor`."""
+    if not tasks:
+        return (None, None)
+
+    return build_page_cursors(tasks[0], tasks[-1], len(tasks), sort, limit, cursor, has_previous)
+
+def build_page_cursors(first, last, count: int, sort: TaskSort, limit: int, cursor: Optional[TaskCursor] = None, has_previous: bool = False) -> Tuple[Optional[str], Optional[str]]:
+    """Like build_task_cursors(), from just the first and last rows of the page."""
+    # Relevance is a computed rank with no stable column to seek on, so it only pages by offset
+    if not count or normalize_sort(sort)[0] == RELEVANCE_SORT:
+        return (None, None)
+
+    full_page = count >= limit
+    if cursor is not None and cursor.direction == "prev":
+        has_next, has_prev = True, full_page
+    else:
+        has_next, has_prev = full_page, cursor is not None or has_previous
+
+    next_cursor = encode_task_cursor(last, sort, "next") if has_next else None
+    prev_cursor = encode_task_cursor(first, sort, "prev") if has_prev else None
+
+    return (next_cursor, prev_cursor)
+
+class TaskPageJSON(NamedTuple):
+    """A task page rendered by Postgres: the JSON array text plus what pagination needs."""
+    tasks_json: str
+    count: int
+    first: Optional[SimpleNamespace]
+    last: Optional[SimpleNamespace]
+
+def resolve_task_fields(requested: Iterable[str]) -> Tuple[str, ...]:
+    """Map requested response keys (camelCase or snake_case) to field names, in schema order.
+
+    `id` is always part of the result so clients can address what they get back.
+    """
+    known = {key: name for name, alias in schema_field_map(GetTaskResponseSchema) for key in (name, alias)}
+    requested = {field.strip() for field in requested if field.strip()}
+    unknown = sorted(requested - known.keys())
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    selected = {known[field] for field in requested} | {"id"}
+    return tuple(name for name in TASK_RESPONSE_FIELDS if name in selected)
+
+def task_list_columns(sort: TaskSort, fields: Optional[Tuple[str, ...]] = None, description_preview: Optional[int] = None) -> tuple:
+    """Columns for a list page: the response `fields` in schema order, then the keyset columns they leave out.
+
+    With `description_preview` only the first N characters of the description
+    are read, so a long (TOASTed) value is not fetched in full.
+    """
+    fields = fields or TASK_RESPONSE_FIELDS
+    columns = []
+    for name in fields:
+        if name == "description" and description_preview is not None:
+            columns.append(func.substr(Task.description, 1, description_preview).label("description"))
         else:
-            queryset = queryset.order_by(asc(sort_column))
-    
-    return queryset
+            columns.append(getattr(Task, name))
+
+    sort_column = ALLOWED_SORT_FIELDS.get(normalize_sort(sort)[0])
+    for column in (Task.id, sort_column):
+        if column is not None and column.key not in fields:
+            columns.append(column)
 
-def get_tasks_list(db: Session, filters: TaskFilters, sort: TaskSort, skip: int = 0, limit: int = 10,) -> Tuple[List[Task], int]:
-    queryset = db.query(Task)
-    queryset = apply_task_filters(queryset, filters)
-    queryset = apply_sorting(queryset, sort.sort_by, sort.sort_order)
-    total = queryset.count()
-    tasks = queryset.offset(skip).limit(limit).all()
+    return tuple(columns)
+
+def build_task_page_query(filters: TaskFilters, sort: TaskSort, dialect_name: str, skip: int = 0, limit: int = 10, cursor: Optional[TaskCursor] = None, columns: Optional[tuple] = None) -> Tuple[Select, list]:
+    """SELECT for one list page, and the ORDER BY clauses it uses.
+
+    Shared by the sync and async services. A `prev` cursor page comes back in
+    reverse and has to be flipped by the caller.
+    """
+    statement = select(*columns) if columns else select(Task)
+    statement = statement.where(*task_filter_conditions(filters, dialect_name))
+
+    if cursor is not None:
+        statement = statement.where(keyset_condition(cursor))
+        sort_by, sort_order = keyset_sort(cursor)
+        search = None
+    else:
+        sort_by, sort_order = normalize_sort(sort)
+        search = filters.search
+        statement = statement.offset(skip)
+
+    order_by = task_order_by(sort_by, sort_order, dialect_name, search)
+    return (statement.order_by(*order_by).limit(limit), order_by)
+
+def build_task_count_query(filters: TaskFilters, dialect_name: str) -> Select:
+    return select(func.count()).select_from(Task).where(*task_filter_conditions(filters, dialect_name))
+
+@read_only
+def get_tasks_list(db: Session, filters: TaskFilters, sort: TaskSort, skip: int = 0, limit: int = 10, cursor: Optional[TaskCursor] = None, with_total: bool = True, columns: Optional[tuple] = None, as_json: bool = False, fields: Optional[Tuple[str, ...]] = None) -> Tuple[list, Optional[int]]:
+    """Return a page of tasks and, if requested, the exact filtered total.
+
+    Pass `columns` to get plain rows of just those columns instead of ORM
+    objects; they must include every column the sort and cursor refer to.
+    With `as_json` (Postgres only) the page comes back as a TaskPageJSON
+    rendered by the database with GetTaskResponseSchema's keys, limited to
+    `fields` when given.
+    """
+    dialect_name = get_dialect_name(db)
+    total = db.scalar(build_task_count_query(filters, dialect_name)) if with_total else None
+
+    if as_json:
+        columns = columns or TASK_RESPONSE_COLUMNS
+    statement, order_by = build_task_page_query(filters, sort, dialect_name, skip, limit, cursor, columns)
+
+    reverse = cursor is not None and cursor.direction == "prev"
+    if as_json:
+        return (render_tasks_json(db, statement, order_by, reverse, fields), total)
+
+    result = db.execute(statement)
+    tasks = list(result.all() if columns else result.scalars().all())
+    if reverse:
+        tasks.reverse()
 
     return (tasks, total)
 
+def fetch_task_page(db: Session, filters: TaskFilters, sort: TaskSort, skip: int = 0, limit: int = 10, cursor: Optional[TaskCursor] = None, as_json: bool = False, fields: Optional[Tuple[str, ...]] = None, description_preview: Optional[int] = None):
+    """The list route's page: task_list_columns() rows, or a TaskPageJSON with `as_json`.
+
+    Concurrent calls for the same normalized query and read source share one
+    execution; the result holds no ORM state, so handing it to other threads
+    is safe. Sessions pinned to the primary always run their own query.
+    """
+    columns = task_list_columns(sort, fields, description_preview)
+    options = dict(skip=skip, limit=limit, cursor=cursor, with_total=False, columns=columns, as_json=as_json, fields=fields)
+    if pinned_to_primary(db):
+        page, _ = get_tasks_list(db, filters, sort, **options)
+        return page
+
+    key = ("page", reads_from_replica(db), normalize_filters(filters), normalize_sort(sort), skip, limit, cursor.model_dump_json() if cursor else None, as_json, fields, description_preview)
+    page, _ = task_query_flight.do(key, get_tasks_list, db, filters, sort, **options)
+    return page
+
+def render_tasks_json(db: Session, statement: Select, order_by: list, reverse: bool = False, fields: Optional[Tuple[str, ...]] = None) -> TaskPageJSON:
+    # The page keeps its ORDER BY/LIMIT; row_number() over the same ordering
+    # lets json_agg put rows back in that order outside the subquery.
+    page = statement.add_columns(func.row_number().over(order_by=order_by).label("ordinal")).subquery()
+    ordinal = page.c.ordinal.desc() if reverse else page.c.ordinal
+
+    pairs = []
+    for name, alias in schema_field_map(GetTaskResponseSchema):
+        if fields and name not in fields:
+            continue
+        column = page.c[name]
+        pairs += [literal(alias), json_timestamp(column) if isinstance(column.type, DateTime) else column]
+    document = func.json_agg(aggregate_order_by(func.json_build_object(*pairs), ordinal))
+
+    # Cursors only need the sortable columns, which may be missing from the response fields
+    keys = [column.key for column in ALLOWED_SORT_FIELDS.values() if column.key in page.c]
+    edges = func.json_agg(aggregate_order_by(func.json_build_object(*[part for key in keys for part in (literal(key), page.c[key])]), ordinal))
+
+    # Cast to text so the driver hands the array over without decoding it
+    tasks_json, count, first, last = db.execute(select(
+        func.coalesce(cast(document, Text), "[]"),
+        func.count(),
+        edges.op("->")(0),
+        edges.op("->")(-1)
+    ).select_from(page)).one()
+
+    def edge(row):
+        return SimpleNamespace(**row) if row else None
+
+    return TaskPageJSON(tasks_json, count, edge(first), edge(last))
+
+def iter_task_batches(db: Session, filters: TaskFilters, sort: TaskSort, batch_size: int = 1000) -> Iterator[list]:
+    """Yield every filtered task as TASK_RESPONSE_COLUMNS rows, `batch_size` at a time.
+
+    Rows are streamed from a server-side cursor, so memory stays bounded by
+    one batch however many tasks match.
+    """
+    sort_by, sort_order = normalize_sort(sort)
+    queryset = apply_task_filters(db.query(*TASK_RESPONSE_COLUMNS), filters)
+    queryset = apply_sorting(queryset, sort_by, sort_order, search=filters.search)
+
+    result = db.execute(queryset.statement, execution_options={"yield_per": batch_size})
+    yield from result.partitions()
+
+def count_tasks(db: Session, filters: TaskFilters) -> Tuple[int, bool]:
+    """Return (total, is_exact) for the filtered task set.
+
+    Results read from the primary are cached per normalized filter set; ones
+    from a lagging replica are not, and sessions pinned to the primary bypass
+    the cache. When the planner expects at least TASK_COUNT_ESTIMATE_THRESHOLD
+    rows, its estimate is returned instead of running an exact COUNT(*).
+    """
+    if pinned_to_primary(db):
+        return compute_task_count(db, filters)
+
+    cache_key = task_count_cache_key(filters)
+    cached = get_cached_task_count(cache_key)
+    if cached is not None:
+        return cached
+
+    from_replica = reads_from_replica(db)
+    result = task_query_flight.do(("count", from_replica, normalize_filters(filters)), compute_task_count, db, filters)
+    if not from_replica:
+        cache_task_count(cache_key, result)
+    return result
+
+def task_count_cache_key(filters: TaskFilters) -> Optional[str]:
+    """Count cache key for `filters`, or None when the cache is off.
+
+    Take it before counting: a write in between moves the generation on, so
+    the stale total is stored under a key nobody reads.
+    """
+    if task_count_cache is None:
+        return None
+
+    return task_count_cache.key(normalize_filters(filters))
+
+def get_cached_task_count(cache_key: Optional[str]) -> Optional[Tuple[int, bool]]:
+    cached = task_count_cache.get(cache_key) if cache_key else None
+    if cached is None:
+        return None
+
+    total, _, exact = cached.partition(b":")
+    return (int(total), exact == b"1")
+
+def cache_task_count(cache_key: Optional[str], result: Tuple[int, bool]):
+    if cache_key:
+        total, exact = result
+        task_count_cache.set(cache_key, f"{total}:{int(exact)}".encode("ascii"))
+
+@read_only
+def compute_task_count(db: Session, filters: TaskFilters) -> Tuple[int, bool]:
+    queryset = apply_task_filters(db.query(Task), filters)
+
+    threshold = settings.TASK_COUNT_ESTIMATE_THRESHOLD
+    if threshold > 0 and get_dialect_name(db) == "postgresql":
+        estimate = estimate_row_count(db, queryset.statement)
+        if estimate >= threshold:
+            return (estimate, False)
+
+    return (queryset.count(), True)
+
+def task_list_cache_key(filters: TaskFilters, sort: TaskSort, page: int, limit: int, cursor: Optional[str], with_total: bool, fields: Optional[Tuple[str, ...]] = None, description_preview: Optional[int] = None) -> Optional[str]:
+    """Response cache key for a list request, or None when the cache is off."""
+    if task_list_cache is None:
+        return None
+
+    return task_list_cache.key((normalize_filters(filters), normalize_sort(sort), page, limit, cursor, with_total, fields, description_preview))
+
+def get_cached_task_list(cache_key: Optional[str]) -> Optional[Tuple[str, bytes]]:
+    """(etag, body) stored under `cache_key`, if any."""
+    cached = task_list_cache.get(cache_key) if cache_key else None
+    if cached is None:
+        return None
+
+    etag, _, body = cached.partition(b"\n")
+    return (etag.decode("ascii"), body)
+
+def cache_task_list(cache_key: Optional[str], etag: str, body: bytes):
+    if cache_key:
+        task_list_cache.set(cache_key, etag.encode("ascii") + b"\n" + body)
+
+@read_only
+def get_task_list_version(db: Session, filters: TaskFilters) -> Tuple[Optional[datetime], int]:
+    """(latest updated_on, row count) of the filtered tasks, from one aggregate query.
+
+    Any insert, update or delete within the filtered set changes one of the two.
+    """
+    conditions = task_filter_conditions(filters, get_dialect_name(db))
+    statement = select(func.max(Task.updated_on), func.count()).select_from(Task).where(*conditions)
+    latest, count = db.execute(statement).one()
+    return (latest, count)
+
 def get_total_tasks(db: Session) -> int:
     return db.query(Task).count()
 
 def update_task_details(task_id:int, task_data: UpdateTaskRequestSchema, db: Session) -> bool:
-    task = db.query(Task).filter_by(id=task_id).first()
+    update_fields = task_data.model_dump(exclude_unset=True, exclude={"id"})
+    if update_fields:
+        statement = update(Task).where(Task.id == task_id).values(**update_fields).returning(Task.id).execution_options(synchronize_session=False)
+    else:
+        statement = select(Task.id).where(Task.id == task_id)
 
-    if not task:
+    if db.execute(statement).scalar() is None:
         return False
 
+    db.commit()
+    invalidate_task_caches()
+
+    return True
+
+def task_selection_conditions(db: Session, filters: TaskFilters, task_ids: Optional[List[int]] = None) -> list:
+    conditions = task_filter_conditions(filters, get_dialect_name(db))
+    if task_ids:
+        conditions.append(Task.id.in_(task_ids))
+
+    # Refuse to touch every task just because the caller forgot a selector
+    if not conditions:
+        raise ValueError("Provide task ids or at least one filter")
+
+    return conditions
+
+def bulk_update_tasks(task_data: UpdateTaskRequestSchema, db: Session, filters: TaskFilters, task_ids: Optional[List[int]] = None, dry_run: bool = False) -> int:
+    conditions = task_selection_conditions(db, filters, task_ids)
     update_fields = task_data.model_dump(exclude_unset=True, exclude={"id"})
-    for field, value in update_fields.items():
-        setattr(task, field, value)
+    if not update_fields:
+        raise ValueError("Provide at least one field to update")
+
+    if dry_run:
+        return db.scalar(select(func.count()).select_from(Task).where(*conditions))
 
+    statement = update(Task).where(*conditions).values(**update_fields).execution_options(synchronize_session=False)
+    affected = db.execute(statement).rowcount
     db.commit()
-    db.refresh(task) 
+    invalidate_task_caches()
 
-    return True
+    return affected
+
+def bulk_remove_tasks(db: Session, filters: TaskFilters, task_ids: Optional[List[int]] = None, dry_run: bool = False) -> int:
+    conditions = task_selection_conditions(db, filters, task_ids)
+
+    if dry_run:
+        return db.scalar(select(func.count()).select_from(Task).where(*conditions))
+
+    statement = delete(Task).where(*conditions).execution_options(synchronize_session=False)
+    affected = db.execute(statement).rowcount
+    db.commit()
+    invalidate_task_caches()
+
+    return affected
 
 def remove_task(task_id: int, db: Session) -> bool:
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if task:
-        db.delete(task)
-        db.commit()
+    statement = delete(Task).where(Task.id == task_id).returning(Task.id).execution_options(synchronize_session="fetch")
+    if db.execute(statement).scalar() is None:
+        return False
 
-        return True
-    
-    return False
\ No newline at end of file
+    db.commit()
+    invalidate_task_caches()
+
+    return True
@@ -1,11 +1,13 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import select, update, delete
 from coe.models.user import User
 from coe.schemas.user import CreateUser, UserLogin, UpdateUser
-from coe.services.auth_service import create_access_token, create_refresh_token
-import bcrypt
+from coe.services.auth_service import create_access_token, create_refresh_token, evict_cached_user
+from coe.services.password_service import hash_password, verify_password, needs_rehash
+from coe.services.task_service import invalidate_task_caches
 
 def create_user(user: CreateUser, db: Session) -> User:
-    hashed_password = bcrypt.hashpw(user.password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    hashed_password = hash_password(user.password)
     
     db_user = User(
         first_name=user.first_name,
@@ -25,8 +27,12 @@ def login_user(login_cred: UserLogin, db: Session) -> dict | None:
     if not user:
         return None
 
-    if not bcrypt.checkpw(login_cred.password.encode(), user.password.encode()):
+    if not verify_password(login_cred.password, user.password):
         return None
+
+    if needs_rehash(user.password):
+        user.password = hash_password(login_cred.password)
+        db.commit()
     
     token_data = {"user_id": user.id}
     access_token = create_access_token(token_data)
@@ -39,28 +45,32 @@ def login_user(login_cred: UserLogin, db: Session) -> dict | None:
     }
 
 def update_user(user_id: int, user_data: UpdateUser, db: Session) -> bool:
-    user = db.query(User).filter_by(id=user_id).first()
+    update_fields = user_data.model_dump(exclude_unset=True, exclude={"id"})
+    if 'password' in update_fields:
+        update_fields['password'] = hash_password(update_fields['password'])
 
-    if not user:
-        return False
+    if update_fields:
+        statement = update(User).where(User.id == user_id).values(**update_fields).returning(User.id).execution_options(synchronize_session=False)
+    else:
+        statement = select(User.id).where(User.id == user_id)
 
-    update_fields = user_data.model_dump(exclude_unset=True, exclude={"id"})
-    for field, value in update_fields.items():
-        if field == 'password':
-            value = bcrypt.hashpw(value.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-        setattr(user, field, value)
+    if db.execute(statement).scalar() is None:
+        return False
 
     db.commit()
-    db.refresh(user) 
+    evict_cached_user(user_id)
 
     return True
 
 def remove_user(user_id: int, db: Session) -> bool:
-    user = db.query(User).filter(User.id == user_id).first()
-    if user:
-        db.delete(user)
-        db.commit()
+    # A plain DELETE lets the foreign keys' ON DELETE rules handle the user's tasks
+    statement = delete(User).where(User.id == user_id).returning(User.id).execution_options(synchronize_session="fetch")
+    if db.execute(statement).scalar() is None:
+        return False
 
-        return True
-    
-    return False
+    db.commit()
+    evict_cached_user(user_id)
+    # The user's tasks went with it
+    invalidate_task_caches()
+
+    return True
@@ -1,11 +1,14 @@
 import os
 import pytest
+from flask import g
 from alembic.config import Config
 from alembic import command
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 os.environ["ENV"] = "test"
+# Routes going over their declared query budget fail the test instead of logging
+os.environ.setdefault("QUERY_BUDGET_MODE", "raise")
 
 from app import create_app
 from coe.models.base import db as _db
@@ -44,7 +47,10 @@ def db(request, app):
     try:
         yield _db.session
     finally:
-        _db.session.close()
+        # Requests here share the session's app context, so drop what a real
+        # request teardown would: the session and the read-your-writes pin
+        _db.session.remove()
+        g.pop("read_primary", None)
         if should_rollback:
             transaction.rollback()
         else:
@@ -0,0 +1,57 @@
+import time
+import pytest
+from faker import Faker
+
+from coe.utils import slow_query_utils
+from coe.utils.instrumentation_utils import add_query_listener, remove_query_listener
+from config import Config
+
+fake = Faker()
+
+
+def login(client):
+    email = fake.unique.email()
+    client.post("/user/register", json={"firstName": fake.first_name(), "lastName": fake.last_name(), "email": email, "password": "secret123"})
+    res = client.post("/user/login", json={"email": email, "password": "secret123"})
+    client.set_cookie(key="access_token", value=res.get_json()["accessToken"])
+    return email
+
+
+@pytest.fixture
+def slow_query_log(monkeypatch):
+    # Every statement counts as slow
+    log = slow_query_utils.SlowQueryLog(threshold_ms=0, max_entries=50)
+    monkeypatch.setattr(slow_query_utils, "slow_query_log", log)
+    add_query_listener(log.record)
+    yield log
+    remove_query_listener(log.record)
+
+
+def test_slow_queries_requires_an_admin(client, monkeypatch):
+    assert client.get("/admin/slow-queries").status_code == 401
+
+    login(client)
+    monkeypatch.setattr(Config, "ADMIN_EMAILS", [])
+    assert client.get("/admin/slow-queries").status_code == 403
+
+
+def test_slow_queries_returns_statements_with_route_and_plan(client, monkeypatch, slow_query_log):
+    email = login(client)
+    monkeypatch.setattr(Config, "ADMIN_EMAILS", [email.lower()])
+
+    assert client.get("/task/list?status=pending").status_code == 200
+
+    # Plans are captured off the request path
+    deadline = time.monotonic() + 10
+    while any(entry["plan_status"] == "pending" for entry in slow_query_log.entries()) and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    res = client.get("/admin/slow-queries")
+
+    assert res.status_code == 200
+    data = res.get_json()
+    assert data["enabled"] is True
+    page_query = next(query for query in data["queries"] if query["route"] == "GET /task/list" and "tasks.status =" in query["statement"] and "LIMIT" in query["statement"])
+    assert "pending" in page_query["parameters"].values()
+    assert page_query["planStatus"] == "captured"
+    assert "Plan" in page_query["plan"][0]
@@ -1,11 +1,13 @@
 import pytest
 from flask import Flask, Request as request
-from jose import jwt
+from jose import jwt, JWTError
 from werkzeug.test import EnvironBuilder
 from werkzeug.wrappers import Request as WerkzeugRequest
 from coe.services import auth_service
-from coe.schemas.user import CreateUser
-from coe.services.user_service import create_user
+from werkzeug.exceptions import Unauthorized
+from coe.schemas.user import CreateUser, UpdateUser
+from coe.services.user_service import create_user, update_user, remove_user
+from coe.utils.cache_utils import TTLCache
 from config import Config as settings
 from faker import Faker
 
@@ -65,3 +67,59 @@ def test_get_current_user_invalid_token(app, db):
             auth_service.get_current_user()
 
         assert "401" in str(exc.value) or hasattr(exc.value, "status_code") and exc.value.status_code == 401
+
+
+def test_get_current_user_resolved_once_per_request(app, db, monkeypatch):
+    user = create_test_user(db)
+    token = auth_service.create_access_token({"user_id": user.id})
+
+    builder = EnvironBuilder(path="/", headers={"Cookie": f"access_token={token}"})
+    env = builder.get_environ()
+
+    with app.test_request_context(environ_base=env):
+        first = auth_service.get_current_user()
+        monkeypatch.setattr(auth_service, "decode_token", lambda token: pytest.fail("token decoded twice"))
+        assert auth_service.get_current_user() is first
+
+
+def test_cached_user_is_evicted_on_update_and_remove(app, db, monkeypatch):
+    monkeypatch.setattr(auth_service, "user_cache", TTLCache(max_size=10, ttl=60))
+    user = create_test_user(db)
+    token = auth_service.create_access_token({"user_id": user.id})
+    env = EnvironBuilder(path="/", headers={"Cookie": f"access_token={token}"}).get_environ()
+
+    with app.test_request_context(environ_base=env):
+        auth_service.get_current_user()
+    assert auth_service.user_cache.get(user.id) is not None
+
+    update_user(user.id, UpdateUser(first_name="Renamed"), db)
+    with app.test_request_context(environ_base=env):
+        assert auth_service.get_current_user().first_name == "Renamed"
+
+    remove_user(user.id, db)
+    with app.test_request_context(environ_base=env):
+        with pytest.raises(Unauthorized):
+            auth_service.get_current_user()
+
+
+def test_decode_token_claims_verifies_each_token_once(monkeypatch):
+    monkeypatch.setattr(auth_service, "token_cache", TTLCache(max_size=10))
+    token = auth_service.create_access_token({"user_id": 7})
+
+    calls = []
+    real_decode = auth_service.jwt.decode
+    monkeypatch.setattr(auth_service.jwt, "decode", lambda *args, **kwargs: calls.append(args) or real_decode(*args, **kwargs))
+
+    assert auth_service.decode_token(token) == 7
+    assert auth_service.decode_token_claims(token)["user_id"] == 7
+    assert len(calls) == 1
+    assert auth_service.get_token_cache_stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_decode_token_claims_rejects_expired_token(monkeypatch):
+    monkeypatch.setattr(auth_service, "token_cache", TTLCache(max_size=10))
+    expired = jwt.encode({"user_id": 7, "exp": 1}, SECRET_KEY, algorithm=ALGORITHM)
+
+    with pytest.raises(JWTError):
+        auth_service.decode_token_claims(expired)
+    assert auth_service.get_token_cache_stats()["size"] == 0
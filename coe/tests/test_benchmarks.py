@@ -0,0 +1,27 @@
+from benchmarks.api import compare_results, summarize
+
+
+def results(**scenarios):
+    return {"results": scenarios}
+
+
+def test_summarize_reports_percentiles_and_throughput():
+    summary = summarize([i / 1000 for i in range(1, 101)], errors=2, elapsed=0.5)
+
+    assert summary == {"requests": 100, "errors": 2, "rps": 200.0, "p50_ms": 50.5, "p99_ms": 100.0}
+
+
+def test_compare_results_flags_regressions_beyond_tolerance():
+    baseline = results(
+        task_get={"p50_ms": 10, "p99_ms": 20, "rps": 100},
+        task_list={"p50_ms": 10, "p99_ms": 20, "rps": 100},
+    )
+    current = results(
+        task_get={"p50_ms": 11, "p99_ms": 23, "rps": 90},
+        task_list={"p50_ms": 10, "p99_ms": 30, "rps": 70},
+        user_me={"p50_ms": 1, "p99_ms": 2, "rps": 1},
+    )
+
+    regressions = compare_results(current, baseline, tolerance=0.2)
+
+    assert [regression.split(" ")[:2] for regression in regressions] == [["task_list:", "p99_ms"], ["task_list:", "rps"]]
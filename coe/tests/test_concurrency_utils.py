@@ -0,0 +1,107 @@
+import threading
+import time
+
+from prometheus_client import REGISTRY
+
+from coe.utils.concurrency_utils import SingleFlight
+
+
+def wait_until(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.001)
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight(timeout=5)
+    release = threading.Event()
+    calls = []
+
+    def query():
+        calls.append(1)
+        release.wait()
+        return ["row"]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("key", query))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: flight.coalesced == 7)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [["row"]] * 8
+    assert flight.stats() == {"executions": 1, "coalesced": 7, "timeouts": 0, "in_flight": 0}
+
+    # Once finished, the key is free again
+    assert flight.do("key", lambda: "fresh") == "fresh"
+
+
+def test_followers_share_the_leaders_exception():
+    flight = SingleFlight(timeout=5)
+    release = threading.Event()
+
+    def failing():
+        release.wait()
+        raise RuntimeError("database went away")
+
+    errors = []
+    def call():
+        try:
+            flight.do("key", failing)
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: flight.coalesced == 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 3
+
+
+def test_waiter_runs_the_call_itself_after_timeout():
+    flight = SingleFlight(timeout=0.05)
+    release = threading.Event()
+    leader = threading.Thread(target=lambda: flight.do("key", release.wait))
+    leader.start()
+    wait_until(lambda: flight.stats()["in_flight"] == 1)
+
+    try:
+        assert flight.do("key", lambda: "own result") == "own result"
+    finally:
+        release.set()
+        leader.join()
+
+    assert flight.timeouts == 1
+    assert flight.executions == 2
+
+
+def test_different_keys_do_not_wait_on_each_other():
+    flight = SingleFlight(timeout=5)
+    assert [flight.do(key, lambda key=key: key * 2) for key in (1, 2)] == [2, 4]
+    assert flight.coalesced == 0
+
+
+def test_named_flight_exports_its_calls_as_metrics():
+    flight = SingleFlight(timeout=5, name="metrics-test")
+    release = threading.Event()
+
+    def sample(result):
+        return REGISTRY.get_sample_value("coe_coalesced_calls_total", {"flight": "metrics-test", "result": result}) or 0
+
+    threads = [threading.Thread(target=flight.do, args=("key", release.wait)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: flight.coalesced == 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert (sample("leader"), sample("coalesced"), sample("timeout")) == (1, 2, 0)
@@ -0,0 +1,83 @@
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from config import Config, build_engine_options
+from coe.services import async_task_service
+from coe.utils.sql_utils import set_local_statement_timeout
+
+POOL_SETTINGS = dict(pool_size=3, max_overflow=2, pool_timeout=1, pool_recycle=60, pool_pre_ping=True)
+
+
+def test_engine_options_apply_statement_timeout_at_connect():
+    options = build_engine_options(**POOL_SETTINGS, statement_timeout_ms=50, pgbouncer_mode=False)
+    engine = create_engine(Config.SQLALCHEMY_DATABASE_URI, **options)
+
+    try:
+        assert engine.pool.size() == 3
+        with engine.connect() as connection:
+            assert connection.execute(text("SHOW statement_timeout")).scalar() == "50ms"
+            with pytest.raises(OperationalError, match="statement timeout"):
+                connection.execute(text("SELECT pg_sleep(1)"))
+    finally:
+        engine.dispose()
+
+
+def test_pgbouncer_mode_uses_null_pool_and_set_local():
+    options = build_engine_options(**POOL_SETTINGS, statement_timeout_ms=50, pgbouncer_mode=True)
+    assert options["poolclass"] is NullPool
+    assert "connect_args" not in options
+
+    engine = create_engine(Config.SQLALCHEMY_DATABASE_URI, **options)
+    session = Session(engine)
+    set_local_statement_timeout(session, 50)
+
+    try:
+        assert session.execute(text("SHOW statement_timeout")).scalar() == "50ms"
+        session.rollback()
+        # SET LOCAL ends with the transaction, so nothing leaks into the server session
+        with engine.connect() as connection:
+            assert connection.execute(text("SHOW statement_timeout")).scalar() == "0"
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def test_async_pgbouncer_mode_disables_statement_caches_and_sets_local_timeout(monkeypatch):
+    monkeypatch.setattr(async_task_service.settings, "DB_PGBOUNCER_MODE", True)
+    monkeypatch.setattr(async_task_service.settings, "DB_STATEMENT_TIMEOUT_MS", 50)
+    assert async_task_service.build_async_connect_args() == {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+
+    async def show_statement_timeout(db):
+        return await db.scalar(text("SHOW statement_timeout"))
+
+    assert asyncio.run(async_task_service.run_in_session(show_statement_timeout)) == "50ms"
+
+
+def test_async_sessions_are_capped_at_the_pool_size(monkeypatch):
+    monkeypatch.setattr(async_task_service, "_connection_slots", threading.BoundedSemaphore(1))
+    monkeypatch.setattr(async_task_service.settings, "DB_POOL_TIMEOUT", 0.2)
+    open_sessions, most_open = [], []
+
+    async def select_one(db):
+        open_sessions.append(db)
+        most_open.append(len(open_sessions))
+        await asyncio.sleep(0.01)
+        result = await db.scalar(text("SELECT 1"))
+        open_sessions.remove(db)
+        return result
+
+    async def page_and_count():
+        return await asyncio.gather(*(async_task_service.run_in_session(select_one) for _ in range(2)))
+
+    assert asyncio.run(page_and_count()) == [1, 1]
+    assert max(most_open) == 1
+
+    async_task_service._connection_slots.acquire()
+    with pytest.raises(PoolTimeoutError):
+        asyncio.run(async_task_service.run_in_session(select_one))
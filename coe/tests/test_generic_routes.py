@@ -0,0 +1,47 @@
+from sqlalchemy.exc import OperationalError
+
+from coe.services import health_service
+
+
+def test_db_health_reports_pool_utilization(client):
+    res = client.get("/health/db")
+
+    assert res.status_code == 200
+    data = res.get_json()
+    assert data["status"] == "ok"
+    assert data["latencyMs"] >= 0
+    assert data["pool"]["poolClass"] == "QueuePool"
+    assert data["pool"]["capacity"] == data["pool"]["size"] + health_service.settings.DB_MAX_OVERFLOW
+    assert 0 <= data["pool"]["utilization"] <= 1
+
+
+def test_db_health_unavailable(client, db, monkeypatch):
+    def fail(*args, **kwargs):
+        raise OperationalError("SELECT 1", {}, Exception("connection refused"))
+    monkeypatch.setattr(db, "execute", fail)
+
+    res = client.get("/health/db")
+
+    assert res.status_code == 503
+    assert res.get_json()["status"] == "unavailable"
+    assert res.get_json()["detail"] == "OperationalError"
+
+
+def test_metrics_exposes_routes_pool_bcrypt_and_caches(client):
+    client.post("/user/register", json={"firstName": "Metric", "lastName": "User", "email": "metrics-user@example.com", "password": "secret123"})
+    login = client.post("/user/login", json={"email": "metrics-user@example.com", "password": "secret123"})
+    client.set_cookie(key="access_token", value=login.get_json()["accessToken"])
+    client.get("/task/list")
+
+    res = client.get("/metrics")
+
+    assert res.status_code == 200
+    assert res.mimetype == "text/plain"
+    body = res.get_data(as_text=True)
+    assert 'coe_http_request_duration_seconds_count{method="GET",namespace="Task",route="/task/list",status="200"}' in body
+    assert 'coe_http_request_duration_seconds_count{method="POST",namespace="User",route="/user/login",status="200"}' in body
+    assert 'coe_db_query_duration_seconds_count{operation="SELECT"}' in body
+    assert 'coe_db_pool_checked_out{bind="default"}' in body
+    assert 'coe_bcrypt_duration_seconds_count{operation="hash"}' in body
+    assert 'coe_bcrypt_duration_seconds_count{operation="verify"}' in body
+    assert 'coe_cache_lookups_total{cache="token",result="miss"}' in body
@@ -0,0 +1,45 @@
+import pstats
+from flask import Flask
+from sqlalchemy import create_engine, text
+
+from coe.utils.instrumentation_utils import add_query_listener, remove_query_listener, init_request_instrumentation, timed
+
+
+def test_query_listener_sees_every_statement():
+    engine = create_engine("sqlite://")
+    seen = []
+    add_query_listener(seen.append)
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+    finally:
+        remove_query_listener(seen.append)
+
+    assert [query.statement for query in seen] == ["SELECT 1", "SELECT 2"]
+    assert all(query.duration >= 0 for query in seen)
+
+
+def test_server_timing_header_and_slow_request_profiles(tmp_path):
+    engine = create_engine("sqlite://")
+    app = Flask(__name__)
+    init_request_instrumentation(app, profile_sample_rate=1, profile_threshold_ms=0, profile_dir=str(tmp_path))
+
+    @app.route("/work")
+    def work():
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+        with timed("serialize"):
+            body = {"ok": True}
+        return body
+
+    response = app.test_client().get("/work")
+
+    metrics = dict(metric.split(";", 1) for metric in response.headers["Server-Timing"].split(", "))
+    assert set(metrics) == {"db", "serialize", "total"}
+    assert 'desc="2x"' in metrics["db"]
+
+    profiles = list(tmp_path.glob("*-GET-work-*.prof"))
+    assert len(profiles) == 1
+    assert pstats.Stats(str(profiles[0])).total_calls > 0
@@ -0,0 +1,54 @@
+import pytest
+from faker import Faker
+from werkzeug.exceptions import ServiceUnavailable
+
+from coe.models.user import User
+from coe.schemas.user import CreateUser, UserLogin
+from coe.services import password_service
+from coe.services.password_service import HashingPool, hash_password, verify_password, needs_rehash
+from coe.services.user_service import create_user, login_user
+
+faker = Faker()
+
+
+def test_hash_and_verify_password_round_trip():
+    hashed = hash_password("s3cret-pass")
+
+    assert verify_password("s3cret-pass", hashed)
+    assert not verify_password("wrong-pass", hashed)
+
+
+def test_hashing_pool_rejects_work_when_saturated():
+    pool = HashingPool(workers=1, queue_size=0, timeout=5)
+    pool._slots.acquire()
+
+    with pytest.raises(ServiceUnavailable):
+        pool.run(password_service._check, b"password", b"hash")
+
+
+def test_hashing_pool_does_not_fork_the_server():
+    pool = HashingPool(workers=1, queue_size=0, timeout=30)
+    hashed = pool.run(password_service._hash, b"password", 4)
+
+    assert pool._executor._mp_context.get_start_method() == "forkserver"
+    assert pool.run(password_service._check, b"password", hashed)
+    pool._executor.shutdown()
+
+
+def test_login_rehashes_password_when_work_factor_changes(db, monkeypatch):
+    user = create_user(CreateUser(
+        first_name=faker.first_name(),
+        last_name=faker.last_name(),
+        email=faker.unique.email(),
+        password="testpass"
+    ), db)
+
+    monkeypatch.setattr(password_service.settings, "BCRYPT_ROUNDS", 4)
+    assert needs_rehash(user.password)
+
+    assert login_user(UserLogin(email=user.email, password="testpass"), db) is not None
+
+    stored = db.get(User, user.id).password
+    assert stored.startswith("$2b$04$")
+    assert not needs_rehash(stored)
+    assert verify_password("testpass", stored)
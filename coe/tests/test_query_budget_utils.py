@@ -0,0 +1,81 @@
+import logging
+import pytest
+from sqlalchemy import create_engine, text
+
+from coe.utils import query_budget_utils
+from coe.utils.query_budget_utils import QueryBudget, QueryBudgetExceeded
+
+engine = create_engine("sqlite://")
+
+
+def run_queries(count):
+    with engine.connect() as connection:
+        for i in range(count):
+            connection.execute(text(f"SELECT {i}"))
+
+
+def test_budget_counts_statements():
+    with QueryBudget(3, mode="raise") as budget:
+        run_queries(3)
+
+    assert budget.count == 3
+
+
+def test_budget_raises_with_the_statements_when_exceeded():
+    with pytest.raises(QueryBudgetExceeded, match="ran 3 queries, over its budget of 2") as exc_info:
+        with QueryBudget(2, name="listing", mode="raise"):
+            run_queries(3)
+
+    assert "SELECT 2" in str(exc_info.value)
+
+
+def test_budget_logs_in_log_mode(caplog, monkeypatch):
+    # The migrations' logging.config.fileConfig() disables loggers that already exist
+    monkeypatch.setattr(query_budget_utils.logger, "disabled", False)
+    with caplog.at_level(logging.WARNING):
+        with QueryBudget(1, name="listing", mode="log"):
+            run_queries(2)
+
+    assert "listing ran 2 queries, over its budget of 1" in caplog.text
+
+
+def test_budget_off_does_not_count():
+    with QueryBudget(0, mode="off") as budget:
+        run_queries(2)
+
+    assert budget.count == 0
+
+
+def test_nested_budgets_both_count():
+    with QueryBudget(5, mode="raise") as outer:
+        run_queries(1)
+        with QueryBudget(5, mode="raise") as inner:
+            run_queries(2)
+
+    assert (outer.count, inner.count) == (3, 2)
+
+
+def test_decorated_function_gets_a_fresh_count_per_call():
+    @QueryBudget(2, mode="raise")
+    def load(count):
+        run_queries(count)
+
+    load(2)
+    load(2)
+    with pytest.raises(QueryBudgetExceeded, match="load ran 3 queries"):
+        load(3)
+
+
+def test_budget_raises_before_the_block_commits():
+    with engine.connect() as connection:
+        connection.execute(text("CREATE TABLE IF NOT EXISTS budgeted (id INTEGER)"))
+        connection.commit()
+
+        with pytest.raises(QueryBudgetExceeded, match="ran 2 queries"):
+            with QueryBudget(1, mode="raise"):
+                connection.execute(text("INSERT INTO budgeted VALUES (1)"))
+                connection.execute(text("INSERT INTO budgeted VALUES (2)"))
+                connection.commit()
+        connection.rollback()
+
+        assert connection.execute(text("SELECT count(*) FROM budgeted")).scalar() == 0
@@ -0,0 +1,167 @@
+from datetime import date
+
+import pytest
+from faker import Faker
+from flask import g
+from sqlalchemy import text, update
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from config import Config
+from coe.models.base import db as _db
+from coe.models.task import Task
+from coe.schemas.task import TaskFilters
+from coe.services import task_service
+from coe.utils import replica_utils
+from coe.utils.cache_utils import GenerationalCache, MemoryCacheBackend
+from coe.utils.replica_utils import ReplicaHealth, read_only, pinned_to_primary, reads_from_replica, READ_PRIMARY_COOKIE
+
+fake = Faker()
+
+BROKEN_REPLICA_URI = Config.SQLALCHEMY_DATABASE_URI.rsplit("@", 1)[0] + "@127.0.0.1:1/nowhere"
+
+
+def make_replica_app(monkeypatch, replica_uri):
+    monkeypatch.setattr(Config, "SQLALCHEMY_BINDS", {"replica": {"url": replica_uri, "pool_pre_ping": True}})
+    monkeypatch.setattr(replica_utils, "replica_health", ReplicaHealth(interval=60))
+    return create_app()
+
+
+@read_only
+def bind_for_read():
+    return _db.session.get_bind(mapper=Task)
+
+
+@pytest.fixture
+def replica_app(monkeypatch):
+    app = make_replica_app(monkeypatch, Config.SQLALCHEMY_DATABASE_URI)
+    with app.app_context():
+        yield app
+        _db.session.remove()
+        for engine in _db.engines.values():
+            engine.dispose()
+
+
+def test_read_only_calls_use_the_replica(replica_app):
+    replica, primary = _db.engines["replica"], _db.engines[None]
+
+    assert bind_for_read() is replica
+    assert _db.session.get_bind(mapper=Task) is primary
+    assert task_service.find_task_by_id(0, _db.session) is None
+
+
+def test_session_sticks_to_primary_after_a_write(replica_app):
+    _db.session.execute(update(Task).where(Task.id == 0).values(name="noop"))
+
+    assert bind_for_read() is _db.engines[None]
+
+
+def test_counts_read_from_the_replica_are_not_cached(replica_app, monkeypatch):
+    backend = MemoryCacheBackend()
+    monkeypatch.setattr(task_service, "task_count_cache", GenerationalCache(backend, "task-count"))
+    filters = TaskFilters(search=fake.uuid4())
+
+    assert reads_from_replica(_db.session)
+    assert task_service.count_tasks(_db.session, filters) == (0, True)
+    assert len(backend.entries) == 0
+
+    _db.session.execute(update(Task).where(Task.id == 0).values(name="noop"))
+    assert not reads_from_replica(_db.session)
+    task_service.count_tasks(_db.session, filters)
+    # Pinned to the primary, so the cache is neither read nor filled
+    assert len(backend.entries) == 0
+
+
+def test_recent_writer_reads_from_primary(replica_app):
+    client = replica_app.test_client()
+    res = client.post("/user/login", json={"email": "nobody@example.com", "password": "wrong-password"})
+    assert READ_PRIMARY_COOKIE not in res.headers.get("Set-Cookie", "")
+
+    with replica_app.test_request_context(headers={"Cookie": f"{READ_PRIMARY_COOKIE}=9999999999"}):
+        replica_app.preprocess_request()
+        assert g.read_primary is True
+        assert bind_for_read() is _db.engines[None]
+
+    with replica_app.test_request_context(headers={"Cookie": f"{READ_PRIMARY_COOKIE}=1"}):
+        replica_app.preprocess_request()
+        assert bind_for_read() is _db.engines["replica"]
+
+
+def test_unhealthy_replica_falls_back_to_primary(monkeypatch):
+    app = make_replica_app(monkeypatch, BROKEN_REPLICA_URI)
+    with app.app_context():
+        replica = _db.engines["replica"]
+        connects = []
+        def connect():
+            connects.append(1)
+            raise OperationalError("SELECT 1", {}, Exception("replica down"))
+        monkeypatch.setattr(replica, "connect", connect)
+
+        assert bind_for_read() is _db.engines[None]
+        assert bind_for_read() is _db.engines[None]
+        # The failed probe is remembered instead of being retried on every read
+        assert len(connects) == 1
+        _db.session.remove()
+
+
+def test_replica_failing_between_probes_falls_back_to_primary(replica_app, monkeypatch):
+    replica = _db.engines["replica"]
+    assert bind_for_read() is replica
+
+    def raw_connection():
+        raise OperationalError("connect", {}, Exception("replica down"))
+    monkeypatch.setattr(replica, "raw_connection", raw_connection)
+
+    assert task_service.find_task_by_id(0, _db.session) is None
+    # Marked unhealthy, so later reads go straight to the primary
+    assert bind_for_read() is _db.engines[None]
+
+
+def test_query_errors_on_the_replica_are_not_retried(replica_app):
+    @read_only
+    def failing_read():
+        _db.session.execute(text("SET LOCAL statement_timeout = 1; SELECT pg_sleep(1)"))
+
+    with pytest.raises(OperationalError, match="statement timeout"):
+        failing_read()
+    assert bind_for_read() is _db.engines["replica"]
+
+
+def test_write_requests_set_the_read_primary_cookie(replica_app):
+    client = replica_app.test_client()
+    res = client.post("/user/register", json={"first_name": "Read", "last_name": "Writes", "email": fake.unique.email(), "password": "secret123"})
+
+    assert res.status_code == 201
+    assert READ_PRIMARY_COOKIE in res.headers["Set-Cookie"]
+
+    res = client.get("/user/me")
+    assert READ_PRIMARY_COOKIE not in res.headers.get("Set-Cookie", "")
+
+
+def test_clients_are_not_pinned_without_a_replica(client):
+    res = client.post("/user/register", json={"first_name": "No", "last_name": "Replica", "email": fake.unique.email(), "password": "secret123"})
+
+    assert res.status_code == 201
+    assert READ_PRIMARY_COOKIE not in res.headers.get("Set-Cookie", "")
+    assert not pinned_to_primary(_db.session)
+
+
+def test_task_list_cache_is_skipped_inside_read_your_writes_window(replica_app, monkeypatch):
+    backend = MemoryCacheBackend()
+    monkeypatch.setattr(task_service, "task_list_cache", GenerationalCache(backend, "task-list"))
+    monkeypatch.setattr(task_service, "task_count_cache", GenerationalCache(backend, "task-count"))
+
+    client = replica_app.test_client()
+    email = fake.unique.email()
+    client.post("/user/register", json={"first_name": "Pinned", "last_name": "Reader", "email": email, "password": "secret123"})
+    client.set_cookie(key="access_token", value=client.post("/user/login", json={"email": email, "password": "secret123"}).get_json()["accessToken"])
+
+    marker = fake.uuid4()
+    task_id = client.post("/task/add", json={"name": f"{marker} pinned", "description": "Pinned", "dueDate": str(date.today())}).get_json()["taskId"]
+    url = f"/task/list?search={marker}"
+    assert client.get(url).get_json()["pagination"]["total"] == 1
+
+    # A write the caches never heard of, e.g. from another service
+    _db.session.add(Task(name=f"{marker} behind the cache", description="Pinned", created_by_id=_db.session.get(Task, task_id).created_by_id, due_date=date.today()))
+    _db.session.commit()
+    assert client.get(url).get_json()["pagination"]["total"] == 2
@@ -0,0 +1,37 @@
+from datetime import date
+from types import SimpleNamespace
+
+from coe.utils.instrumentation_utils import QueryEvent
+from coe.utils.slow_query_utils import SlowQueryLog, redact_parameters
+
+
+def test_redact_parameters_drops_secrets_and_long_text():
+    redacted = redact_parameters({
+        "email_1": "someone@example.com",
+        "password": "hunter2",
+        "status_1": "pending",
+        "due_date_1": date(2030, 1, 2),
+        "param_1": 10,
+        "search_1": "x" * 100,
+    })
+
+    assert redacted == {
+        "email_1": "[REDACTED]",
+        "password": "[REDACTED]",
+        "status_1": "pending",
+        "due_date_1": "2030-01-02",
+        "param_1": 10,
+        "search_1": "[str, 100 long]",
+    }
+    assert redact_parameters(("pending", 5)) == ["pending", 5]
+
+
+def test_slow_query_log_keeps_only_slow_statements_in_a_ring_buffer():
+    log = SlowQueryLog(threshold_ms=100, max_entries=2, explain=False)
+    connection = SimpleNamespace(engine=None)
+
+    for duration in (0.05, 0.2, 0.3, 0.4):
+        log.record(QueryEvent(f"SELECT {duration}", {}, duration, False, connection))
+
+    assert [entry["statement"] for entry in log.entries()] == ["SELECT 0.4", "SELECT 0.3"]
+    assert all(entry["plan_status"] == "not_requested" and entry["route"] is None for entry in log.entries())
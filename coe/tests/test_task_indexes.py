@@ -0,0 +1,91 @@
+import itertools
+import random
+from datetime import date, timedelta
+
+import pytest
+from faker import Faker
+from sqlalchemy import func, insert, select, text
+
+from coe.models.task import Task
+from coe.schemas.task import TaskFilters, TaskSort
+from coe.schemas.user import CreateUser
+from coe.services import task_service
+from coe.services.user_service import create_user
+from coe.utils.sql_utils import Explain
+
+fake = Faker()
+
+STATUSES = [None, "pending", "in_progress", "completed"]
+PRIORITIES = [None, "low", "medium", "high"]
+SEARCHES = [None, "quarterly report"]
+SORT_FIELDS = [None, "id", "name", "dueDate", "startDate", "priority"]
+SORT_ORDERS = ["asc", "desc"]
+
+
+@pytest.fixture
+def seeded_tasks(db):
+    user = create_user(CreateUser(
+        first_name=fake.first_name(),
+        last_name=fake.last_name(),
+        email=fake.unique.email(),
+        password="testpassword"
+    ), db)
+
+    words = fake.words(nb=50)
+    db.execute(insert(Task), [
+        {
+            "name": " ".join(random.choices(words, k=3)),
+            "description": " ".join(random.choices(words, k=30)),
+            "created_by_id": user.id,
+            "due_date": date(2025, 1, 1) + timedelta(days=i % 365),
+            "start_date": None if i % 4 == 0 else date(2024, 12, 1) + timedelta(days=i % 30),
+            "priority": random.choice(["low", "medium", "high"]),
+            "status": random.choice(["pending", "in_progress", "completed"]),
+        }
+        for i in range(3000)
+    ])
+    db.execute(text("ANALYZE tasks"))
+
+    # With sequential scans priced out, the planner only picks one when no index can serve the query
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+
+    yield
+
+    db.rollback()
+
+
+def find_seq_scans(plan):
+    scans = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") == "tasks":
+        scans.append(plan)
+    for child in plan.get("Plans", []):
+        scans.extend(find_seq_scans(child))
+    return scans
+
+
+def list_statements(db, filters, sort):
+    queryset = task_service.apply_task_filters(db.query(Task), filters)
+    count_statement = select(func.count()).select_from(queryset.subquery())
+
+    sort_by, sort_order = task_service.normalize_sort(sort)
+    page_statement = task_service.apply_sorting(queryset, sort_by, sort_order, search=filters.search).offset(50).limit(10).statement
+
+    return {"count": count_statement, "page": page_statement}
+
+
+def test_task_list_queries_never_fall_back_to_seq_scan(db, seeded_tasks):
+    sort_fields = SORT_FIELDS + ["relevance"]
+
+    failures = []
+    for status, priority, search, sort_by, sort_order in itertools.product(STATUSES, PRIORITIES, SEARCHES, sort_fields, SORT_ORDERS):
+        if sort_by == "relevance" and not search:
+            continue
+
+        filters = TaskFilters(status=status, priority=priority, search=search)
+        sort = TaskSort(sort_by=sort_by, sort_order=sort_order)
+        for kind, statement in list_statements(db, filters, sort).items():
+            plan = db.execute(Explain(statement)).scalar()[0]["Plan"]
+            if find_seq_scans(plan):
+                failures.append(f"{kind}: status={status} priority={priority} search={search} sortBy={sort_by} sortOrder={sort_order}")
+
+    assert not failures, "Sequential scan on tasks for:\n" + "\n".join(failures)
@@ -1,10 +1,48 @@
-from datetime import date, timedelta
+import csv
+import gzip
+import io
+import json
+from datetime import date, datetime, timedelta, timezone
 from faker import Faker
 import pytest
+import redis
+from sqlalchemy import update, event
+
+from coe.models.task import Task
+from coe.services import auth_service, task_service
+from coe.utils.query_budget_utils import QueryBudget
+from coe.utils.cache_utils import TTLCache, GenerationalCache, MemoryCacheBackend, RedisCacheBackend
+from config import Config
 
 fake = Faker()
 
 
+class FakeRedis:
+    """Just enough of redis.Redis for RedisCacheBackend."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value if isinstance(value, bytes) else str(value).encode()
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+        return int(self.data[key])
+
+
+class DownRedis:
+    """A redis.Redis whose server cannot be reached."""
+
+    def get(self, key):
+        raise redis.ConnectionError("Connection refused")
+
+    set = incr = get
+
+
 @pytest.fixture
 def auth_client(client):
     email = fake.unique.email()
@@ -116,3 +154,312 @@ def test_get_task_list(auth_client):
     assert "tasks" in data
     assert "pagination" in data
     assert data["pagination"]["count"] == 2
+
+
+def test_get_task_list_query_count_does_not_grow_with_page_size(auth_client):
+    for i in range(30):
+        auth_client.post("/task/add", json={"name": f"Budget {i}", "description": "N+1 guard", "dueDate": str(date.today())})
+
+    with QueryBudget(5) as budget:
+        res = auth_client.get("/task/list?records_per_page=30")
+
+    assert res.status_code == 200
+    assert len(res.get_json()["tasks"]) == 30
+    assert budget.count <= 5
+
+def test_get_task_list_with_cursor(auth_client):
+    for i in range(3):
+        auth_client.post("/task/add", json={
+            "name": f"Cursor Task {i}",
+            "description": "Cursor pagination",
+            "dueDate": str(date.today() + timedelta(days=i)),
+        })
+
+    first = auth_client.get("/task/list?records_per_page=2&sortBy=dueDate&sortOrder=desc").get_json()
+    next_cursor = first["pagination"]["nextCursor"]
+    assert next_cursor is not None
+
+    res = auth_client.get(f"/task/list?records_per_page=2&sortBy=dueDate&sortOrder=desc&cursor={next_cursor}")
+    assert res.status_code == 200
+    data = res.get_json()
+    assert data["pagination"]["page"] is None
+    assert data["pagination"]["prevCursor"] is not None
+    assert not {t["id"] for t in first["tasks"]} & {t["id"] for t in data["tasks"]}
+
+    res = auth_client.get(f"/task/list?sortBy=name&cursor={next_cursor}")
+    assert res.status_code == 422
+
+
+def test_get_task_list_without_total(auth_client):
+    auth_client.post("/task/add", json={
+        "name": "Uncounted Task",
+        "description": "No total requested",
+        "dueDate": str(date.today()),
+    })
+
+    res = auth_client.get("/task/list?withTotal=false")
+    assert res.status_code == 200
+    pagination = res.get_json()["pagination"]
+    assert pagination["total"] is None
+    assert pagination["totalPages"] is None
+
+    pagination = auth_client.get("/task/list").get_json()["pagination"]
+    assert pagination["totalType"] == "exact"
+    assert pagination["total"] >= 1
+
+
+def test_get_task_list_rendered_in_database(auth_client, monkeypatch):
+    marker = fake.uuid4()
+    for i in range(3):
+        auth_client.post("/task/add", json={
+            "name": f"{marker} Tâche {i}",
+            "description": "Rendered by Postgres",
+            "dueDate": str(date.today() + timedelta(days=i)),
+            "priority": "high"
+        })
+
+    url = f"/task/list?records_per_page=2&sortBy=dueDate&search={marker}"
+    expected = auth_client.get(url).get_json()
+
+    monkeypatch.setattr(Config, "TASK_LIST_RENDER_IN_DATABASE", True)
+    res = auth_client.get(url)
+
+    assert res.status_code == 200
+    assert res.mimetype == "application/json"
+    assert res.get_json() == expected
+    assert len(expected["tasks"]) == 2
+    assert expected["pagination"]["nextCursor"] is not None
+
+@pytest.mark.parametrize("render_in_database", [False, True], ids=["rows", "database"])
+def test_get_task_list_sparse_fields(auth_client, monkeypatch, render_in_database):
+    marker = fake.uuid4()
+    for i in range(3):
+        auth_client.post("/task/add", json={
+            "name": f"{marker} Sparse {i}",
+            "description": "A fairly long description that only needs a preview",
+            "dueDate": str(date.today() + timedelta(days=i)),
+        })
+    monkeypatch.setattr(Config, "TASK_LIST_RENDER_IN_DATABASE", render_in_database)
+
+    # dueDate is the sort key but not requested, so the cursor must still be built from it
+    url = f"/task/list?records_per_page=2&sortBy=dueDate&search={marker}&fields=name,description&descriptionPreview=6"
+    res = auth_client.get(url)
+
+    assert res.status_code == 200
+    data = res.get_json()
+    assert [set(task) for task in data["tasks"]] == [{"id", "name", "description"}] * 2
+    assert data["tasks"][0]["description"] == "A fair"
+
+    next_page = auth_client.get(f"{url}&cursor={data['pagination']['nextCursor']}").get_json()
+    assert [task["name"] for task in next_page["tasks"]] == [f"{marker} Sparse 2"]
+
+def test_get_task_list_rejects_unknown_fields(auth_client):
+    res = auth_client.get("/task/list?fields=name,secret")
+    assert res.status_code == 422
+    assert "secret" in res.get_json()["detail"]
+
+    res = auth_client.get("/task/list?descriptionPreview=-1")
+    assert res.status_code == 422
+
+def test_export_tasks_streams_ndjson_and_csv(auth_client, monkeypatch):
+    marker = fake.uuid4()
+    for i in range(5):
+        auth_client.post("/task/add", json={
+            "name": f"{marker} Export {i}",
+            "description": "Exported, with a comma",
+            "dueDate": str(date.today() + timedelta(days=i)),
+        })
+    monkeypatch.setattr(Config, "TASK_EXPORT_BATCH_SIZE", 2)
+
+    listed = auth_client.get(f"/task/list?records_per_page=10&sortBy=dueDate&sortOrder=desc&search={marker}").get_json()["tasks"]
+
+    res = auth_client.get(f"/task/export?sortBy=dueDate&sortOrder=desc&search={marker}")
+    assert res.status_code == 200
+    assert res.mimetype == "application/x-ndjson"
+    assert [json.loads(line) for line in res.get_data(as_text=True).splitlines()] == listed
+
+    res = auth_client.get(f"/task/export?format=csv&sortBy=dueDate&sortOrder=desc&search={marker}", headers={"Accept-Encoding": "gzip"})
+    assert res.status_code == 200
+    assert res.headers["Content-Encoding"] == "gzip"
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(res.get_data()).decode("utf-8"))))
+    assert [row["name"] for row in rows] == [task["name"] for task in listed]
+    assert rows[0]["description"] == "Exported, with a comma"
+
+def test_export_tasks_rejects_unknown_format(auth_client):
+    res = auth_client.get("/task/export?format=xml")
+    assert res.status_code == 422
+
+def test_get_task_honors_if_none_match(auth_client, db):
+    task_id = auth_client.post("/task/add", json={
+        "name": "Polled Task",
+        "description": "Fetched over and over",
+        "dueDate": str(date.today()),
+    }).get_json()["taskId"]
+
+    res = auth_client.get(f"/task/{task_id}")
+    etag = res.headers["ETag"]
+    assert res.status_code == 200
+
+    res = auth_client.get(f"/task/{task_id}", headers={"If-None-Match": etag})
+    assert res.status_code == 304
+    assert res.headers["ETag"] == etag
+    assert res.get_data() == b""
+
+    db.execute(update(Task).where(Task.id == task_id).values(updated_on=datetime(2030, 1, 1, tzinfo=timezone.utc)))
+    res = auth_client.get(f"/task/{task_id}", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+
+def test_get_task_list_honors_if_none_match(auth_client):
+    marker = fake.uuid4()
+    auth_client.post("/task/add", json={"name": f"{marker} first", "description": "Listed", "dueDate": str(date.today())})
+
+    url = f"/task/list?search={marker}"
+    etag = auth_client.get(url).headers["ETag"]
+
+    assert auth_client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert auth_client.get(f"{url}&sortOrder=desc", headers={"If-None-Match": etag}).status_code == 200
+
+    auth_client.post("/task/add", json={"name": f"{marker} second", "description": "Listed", "dueDate": str(date.today())})
+    res = auth_client.get(url, headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.get_json()["pagination"]["count"] == 2
+
+def test_get_task_list_runs_version_aggregate_only_to_revalidate(auth_client, db, monkeypatch):
+    monkeypatch.setattr(task_service, "task_list_cache", None)
+    marker = fake.uuid4()
+    auth_client.post("/task/add", json={"name": f"{marker} first", "description": "Listed", "dueDate": str(date.today())})
+    url = f"/task/list?search={marker}"
+
+    statements = []
+    engine = db.get_bind()
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        etag = auth_client.get(f"{url}&withTotal=false").headers["ETag"]
+        assert not any("max(tasks.updated_on)" in statement for statement in statements)
+
+        # The aggregate's count is the total, so count_tasks is not asked again
+        monkeypatch.setattr("coe.api.task.routes.count_tasks", None)
+        res = auth_client.get(url, headers={"If-None-Match": etag})
+        assert any("max(tasks.updated_on)" in statement for statement in statements)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert res.status_code == 200
+    assert res.get_json()["pagination"]["total"] == 1
+    assert res.get_json()["pagination"]["totalType"] == "exact"
+    assert auth_client.get(url, headers={"If-None-Match": res.headers["ETag"]}).status_code == 304
+
+@pytest.mark.parametrize("backend", [MemoryCacheBackend(), RedisCacheBackend(FakeRedis())], ids=["memory", "redis"])
+def test_task_list_response_cache(auth_client, db, monkeypatch, backend):
+    monkeypatch.setattr(task_service, "task_list_cache", GenerationalCache(backend, "task-list"))
+    monkeypatch.setattr(auth_service, "user_cache", TTLCache(max_size=10, ttl=60))
+
+    marker = fake.uuid4()
+    auth_client.post("/task/add", json={"name": f"{marker} cached", "description": "Cached", "dueDate": str(date.today())})
+    url = f"/task/list?search={marker}&sortBy=name"
+    first = auth_client.get(url)
+
+    statements = []
+    engine = db.get_bind()
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        # Same normalized query, spelled differently
+        second = auth_client.get(f"/task/list?sortBy=name&sortOrder=asc&search={marker}")
+        not_modified = auth_client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert statements == []
+    assert second.get_data() == first.get_data()
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert not_modified.status_code == 304
+
+    auth_client.post("/task/add", json={"name": f"{marker} newer", "description": "Cached", "dueDate": str(date.today())})
+    assert auth_client.get(url).get_json()["pagination"]["count"] == 2
+
+def test_task_endpoints_on_async_service(auth_client, monkeypatch):
+    monkeypatch.setattr(Config, "TASK_ASYNC_ROUTES", True)
+    marker = fake.uuid4()
+
+    res = auth_client.post("/task/add", json={"name": f"{marker} async", "description": "Through asyncpg", "dueDate": str(date.today()), "priority": "high"})
+    assert res.status_code == 201
+    task_id = res.get_json()["taskId"]
+
+    res = auth_client.get(f"/task/{task_id}")
+    assert res.status_code == 200
+    assert res.get_json()["priority"] == "high"
+
+    assert auth_client.put(f"/task/{task_id}", json={"status": "completed"}).status_code == 200
+
+    data = auth_client.get(f"/task/list?search={marker}").get_json()
+    assert [task["status"] for task in data["tasks"]] == ["completed"]
+    assert data["pagination"]["total"] == 1
+
+    monkeypatch.setattr(Config, "TASK_ASYNC_ROUTES", False)
+    assert auth_client.get(f"/task/list?search={marker}").get_json()["tasks"] == data["tasks"]
+
+    monkeypatch.setattr(Config, "TASK_ASYNC_ROUTES", True)
+    assert auth_client.delete(f"/task/{task_id}").status_code == 200
+    assert auth_client.get(f"/task/{task_id}").status_code == 404
+
+def test_bulk_create_tasks(auth_client):
+    payload = {"tasks": [
+        {"name": "Bulk 1", "description": "First", "dueDate": str(date.today()), "priority": "high"},
+        {"name": "", "description": "Invalid name", "dueDate": str(date.today())},
+        {"name": "Bulk 3", "description": "Third", "dueDate": str(date.today()), "assigneeId": 999999},
+        {"name": "Bulk 4", "description": "Fourth", "dueDate": str(date.today())},
+    ]}
+
+    res = auth_client.post("/task/bulk", json=payload)
+    assert res.status_code == 201
+    data = res.get_json()
+    assert len(data["taskIds"]) == 2
+    assert [error["index"] for error in data["errors"]] == [1, 2]
+
+    first = auth_client.get(f"/task/{data['taskIds'][0]}").get_json()
+    assert first["name"] == "Bulk 1"
+    assert first["priority"] == "high"
+    assert auth_client.get(f"/task/{data['taskIds'][1]}").get_json()["priority"] == "low"
+
+
+def test_bulk_create_tasks_rejects_oversized_batch(auth_client, monkeypatch):
+    monkeypatch.setattr("coe.api.task.routes.settings.TASK_BULK_MAX_BATCH_SIZE", 1)
+    task = {"name": "Bulk", "description": "Too many", "dueDate": str(date.today())}
+
+    res = auth_client.post("/task/bulk", json={"tasks": [task, task]})
+    assert res.status_code == 413
+
+
+def test_bulk_update_and_delete_tasks(auth_client):
+    created = auth_client.post("/task/bulk", json={"tasks": [
+        {"name": f"Bulk change {i}", "description": "Bulk change", "dueDate": str(date.today())} for i in range(3)
+    ]}).get_json()["taskIds"]
+
+    res = auth_client.put("/task/bulk", json={"ids": created, "patch": {"priority": "high"}, "dryRun": True})
+    assert res.status_code == 200
+    assert res.get_json()["affected"] == 3
+    assert auth_client.get(f"/task/{created[0]}").get_json()["priority"] == "low"
+
+    res = auth_client.put("/task/bulk", json={"ids": created, "patch": {"priority": "high"}})
+    assert res.get_json()["affected"] == 3
+    assert auth_client.get(f"/task/{created[0]}").get_json()["priority"] == "high"
+
+    res = auth_client.delete("/task/bulk", json={"ids": created[:2]})
+    assert res.get_json()["affected"] == 2
+    assert auth_client.get(f"/task/{created[0]}").status_code == 404
+
+    assert auth_client.delete("/task/bulk", json={}).status_code == 422
+
+def test_task_routes_keep_working_while_redis_is_down(auth_client, monkeypatch):
+    monkeypatch.setattr(task_service, "task_list_cache", GenerationalCache(RedisCacheBackend(DownRedis()), "task-list"))
+    monkeypatch.setattr(task_service, "task_count_cache", GenerationalCache(RedisCacheBackend(DownRedis()), "task-count"))
+
+    marker = fake.uuid4()
+    assert auth_client.post("/task/add", json={"name": f"{marker} first", "description": "Uncached", "dueDate": str(date.today())}).status_code == 201
+    assert auth_client.get(f"/task/list?search={marker}").get_json()["pagination"]["count"] == 1
+
+    auth_client.post("/task/add", json={"name": f"{marker} second", "description": "Uncached", "dueDate": str(date.today())})
+    assert auth_client.get(f"/task/list?search={marker}").get_json()["pagination"]["count"] == 2
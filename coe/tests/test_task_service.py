@@ -1,17 +1,23 @@
+import json
 import pytest
 from datetime import date
 from faker import Faker
+from flask import jsonify
+from sqlalchemy import event
 
 from coe.services import task_service
-from coe.services.user_service import create_user
+from coe.services.user_service import create_user, update_user, remove_user
 from coe.models.task import Task, PriorityEnum
-from coe.schemas.user import CreateUser
+from coe.schemas.user import CreateUser, UpdateUser
 from coe.schemas.task import (
     CreateTaskRequestSchema,
     UpdateTaskRequestSchema,
+    GetTaskResponseSchema,
     TaskFilters,
     TaskSort
 )
+from coe.utils.format_utils import serialize_rows
+from coe.utils.cache_utils import GenerationalCache, MemoryCacheBackend
 
 fake = Faker()
 
@@ -100,6 +106,22 @@ def test_update_task_details(db, sample_task):
     assert sample_task.description == update_data.description
     assert sample_task.priority.value == update_data.priority.value
 
+def test_update_and_remove_task_use_one_statement_each(db, sample_task):
+    task_id = sample_task.id
+    statements = []
+    def record(conn, cursor, statement, *args):
+        statements.append(statement.split()[0])
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        assert task_service.update_task_details(task_id, UpdateTaskRequestSchema(name="Renamed"), db) is True
+        assert task_service.remove_task(task_id, db) is True
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert statements == ["UPDATE", "DELETE"]
+
 def test_update_task_details_not_found(db):
     update_data = UpdateTaskRequestSchema(
         name="Ghost Task",
@@ -124,3 +146,221 @@ def test_remove_task_not_found(db):
     result = task_service.remove_task(99999, db)
 
     assert result is False
+
+@pytest.mark.parametrize("sort_by", ["id", "name", "dueDate", "startDate", "priority"])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+def test_get_tasks_list_cursor_matches_offset_order(db, sample_user, sort_by, sort_order):
+    marker = fake.uuid4()
+    db.add_all([
+        Task(name=f"Task {i % 3}", description=f"Keyset {marker}", created_by_id=sample_user.id,
+             due_date=date(2025, 6, 1 + i % 4), start_date=date(2025, 5, 1 + i % 2) if i % 3 else None,
+             priority=list(PriorityEnum)[i % 3])
+        for i in range(11)
+    ])
+    db.commit()
+
+    filters = TaskFilters(search=marker)
+    sort = TaskSort(sort_by=sort_by, sort_order=sort_order)
+    expected, _ = task_service.get_tasks_list(db, filters, sort, limit=100)
+
+    seen, cursor = [], None
+    while True:
+        page, total = task_service.get_tasks_list(db, filters, sort, limit=4, cursor=cursor)
+        seen.extend(page)
+        next_cursor, _ = task_service.build_task_cursors(page, sort, 4, cursor)
+        if not next_cursor:
+            break
+        cursor = task_service.decode_task_cursor(next_cursor, sort)
+
+    assert total == 11
+    assert [t.id for t in seen] == [t.id for t in expected]
+
+    page, _ = task_service.get_tasks_list(db, filters, sort, limit=4, cursor=cursor)
+    _, prev_cursor = task_service.build_task_cursors(page, sort, 4, cursor)
+    previous, _ = task_service.get_tasks_list(db, filters, sort, limit=4, cursor=task_service.decode_task_cursor(prev_cursor, sort))
+    assert [t.id for t in previous] == [t.id for t in expected[4:8]]
+
+def test_decode_task_cursor_rejects_mismatched_sort(db, sample_task):
+    cursor = task_service.encode_task_cursor(sample_task, TaskSort(sort_by="name"), "next")
+
+    with pytest.raises(ValueError):
+        task_service.decode_task_cursor(cursor, TaskSort(sort_by="dueDate"))
+    with pytest.raises(ValueError):
+        task_service.decode_task_cursor("not-a-cursor", TaskSort())
+
+def test_count_tasks_is_cached_until_a_task_write(db, sample_user):
+    marker = fake.uuid4()
+    filters = TaskFilters(search=marker)
+    task_data = CreateTaskRequestSchema(name="Counted", description=f"Count {marker}", due_date=date(2025, 6, 1))
+
+    task_service.create_task(task_data, db, sample_user)
+    assert task_service.count_tasks(db, filters) == (1, True)
+
+    db.add(Task(name="Uncounted", description=f"Count {marker}", created_by_id=sample_user.id, due_date=date(2025, 6, 1)))
+    db.commit()
+    assert task_service.count_tasks(db, filters) == (1, True)
+
+    task_service.create_task(task_data, db, sample_user)
+    assert task_service.count_tasks(db, filters) == (3, True)
+
+def test_count_computed_before_a_write_is_not_served_after_it(db, sample_user):
+    marker = fake.uuid4()
+    filters = TaskFilters(search=marker)
+
+    # A slow count takes its key, a write lands, then the count is stored
+    cache_key = task_service.task_count_cache_key(filters)
+    task_service.create_task(CreateTaskRequestSchema(name="Raced", description=f"Count {marker}", due_date=date(2025, 6, 1)), db, sample_user)
+    task_service.cache_task_count(cache_key, (0, True))
+
+    assert task_service.count_tasks(db, filters) == (1, True)
+
+def test_updating_a_user_keeps_cached_task_lists(db, sample_user, monkeypatch):
+    monkeypatch.setattr(task_service, "task_list_cache", GenerationalCache(MemoryCacheBackend(), "task-list"))
+    filters, sort = TaskFilters(search=fake.uuid4()), TaskSort()
+    cache_key = task_service.task_list_cache_key(filters, sort, 1, 10, None, True)
+    task_service.cache_task_list(cache_key, "etag", b"[]")
+
+    assert update_user(sample_user.id, UpdateUser(first_name="Renamed"), db)
+    assert task_service.task_list_cache_key(filters, sort, 1, 10, None, True) == cache_key
+    assert task_service.get_cached_task_list(cache_key) == ("etag", b"[]")
+
+def test_removing_a_user_invalidates_counts_of_their_tasks(db, sample_user):
+    marker = fake.uuid4()
+    filters = TaskFilters(search=marker)
+    task_service.create_task(CreateTaskRequestSchema(name="Orphaned", description=f"Count {marker}", due_date=date(2025, 6, 1)), db, sample_user)
+    assert task_service.count_tasks(db, filters) == (1, True)
+
+    assert remove_user(sample_user.id, db)
+    assert task_service.count_tasks(db, filters) == (0, True)
+
+def test_count_tasks_uses_planner_estimate_past_threshold(db, sample_task, monkeypatch):
+    monkeypatch.setattr(task_service.settings, "TASK_COUNT_ESTIMATE_THRESHOLD", 1)
+    task_service.invalidate_task_caches()
+
+    total, exact = task_service.count_tasks(db, TaskFilters(priority="medium"))
+
+    assert exact is False
+    assert total >= 1
+    task_service.invalidate_task_caches()
+
+def test_get_tasks_list_search_sorted_by_relevance(db, sample_user):
+    marker = fake.uuid4().replace("-", "")
+    weak = Task(name="Unrelated", description=f"mentions {marker} once", created_by_id=sample_user.id, due_date=date(2025, 6, 1))
+    strong = Task(name=f"{marker} launch", description=f"{marker} {marker} checklist", created_by_id=sample_user.id, due_date=date(2025, 6, 1))
+    db.add_all([weak, strong])
+    db.commit()
+
+    tasks, total = task_service.get_tasks_list(db, TaskFilters(search=marker), TaskSort(sort_by="relevance"))
+    assert total == 2
+    assert [t.id for t in tasks] == [strong.id, weak.id]
+
+    # Matching inside words needs the pg_trgm indexes; without them search is full-text only
+    tasks, _ = task_service.get_tasks_list(db, TaskFilters(search=marker[4:12].upper()), TaskSort())
+    expected = {strong.id, weak.id} if task_service.trigram_search_available() else set()
+    assert {t.id for t in tasks} == expected
+
+def test_search_condition_leaves_out_unindexed_like_on_postgres(monkeypatch):
+    monkeypatch.setattr(task_service, "_trigram_search", False)
+    condition = str(task_service.search_condition("Report", "postgresql"))
+    assert "to_tsvector" in condition
+    assert "LIKE" not in condition
+
+    monkeypatch.setattr(task_service, "_trigram_search", True)
+    condition = str(task_service.search_condition("Report", "postgresql"))
+    assert "lower(tasks.name) LIKE" in condition
+
+def test_search_condition_falls_back_to_like_outside_postgres():
+    condition = str(task_service.search_condition("Report", "sqlite"))
+
+    assert "to_tsvector" not in condition
+    assert "lower(tasks.name) LIKE" in condition
+
+def test_bulk_update_tasks_by_filter(db, sample_user):
+    marker = fake.uuid4()
+    db.add_all([
+        Task(name=f"Sprint {i}", description=f"Bulk {marker}", created_by_id=sample_user.id,
+             due_date=date(2025, 6, 1), priority=PriorityEnum.low if i < 3 else PriorityEnum.high)
+        for i in range(5)
+    ])
+    db.commit()
+
+    filters = TaskFilters(search=marker, priority="low")
+    patch = UpdateTaskRequestSchema(status="completed")
+
+    assert task_service.bulk_update_tasks(patch, db, filters, dry_run=True) == 3
+    assert task_service.count_tasks(db, TaskFilters(search=marker, status="completed")) == (0, True)
+
+    assert task_service.bulk_update_tasks(patch, db, filters) == 3
+    assert task_service.count_tasks(db, TaskFilters(search=marker, status="completed")) == (3, True)
+
+def test_bulk_remove_tasks_by_ids(db, sample_user):
+    tasks = [Task(name=f"Remove {i}", description="Bulk remove", created_by_id=sample_user.id, due_date=date(2025, 6, 1)) for i in range(3)]
+    db.add_all(tasks)
+    db.commit()
+    task_ids = [task.id for task in tasks]
+
+    assert task_service.bulk_remove_tasks(db, TaskFilters(), task_ids[:2]) == 2
+    assert db.query(Task).filter(Task.id.in_(task_ids)).count() == 1
+
+def test_bulk_change_requires_a_selector(db):
+    with pytest.raises(ValueError):
+        task_service.bulk_remove_tasks(db, TaskFilters())
+
+def test_serialize_rows_matches_pydantic_output(db, sample_user):
+    marker = fake.uuid4()
+    db.add_all([
+        Task(name=f"{marker} Überprüfung ✓", description="Ünïcode \"quoted\" text", created_by_id=sample_user.id,
+             assignee_id=sample_user.id, due_date=date(2025, 6, 1), start_date=date(2025, 5, 20), priority=PriorityEnum.high),
+        Task(name=f"{marker} plain", description="", created_by_id=sample_user.id, due_date=date(2025, 6, 2)),
+    ])
+    db.commit()
+
+    filters = TaskFilters(search=marker)
+    sort = TaskSort(sort_by="dueDate")
+    tasks, _ = task_service.get_tasks_list(db, filters, sort, with_total=False)
+    rows, _ = task_service.get_tasks_list(db, filters, sort, with_total=False, columns=task_service.TASK_RESPONSE_COLUMNS)
+
+    expected = [GetTaskResponseSchema.model_validate(task).model_dump(by_alias=True, mode="json") for task in tasks]
+    assert len(rows) == 2
+    assert jsonify(serialize_rows(rows, GetTaskResponseSchema)).get_data() == jsonify(expected).get_data()
+
+@pytest.mark.parametrize("sort_by,sort_order", [("dueDate", "asc"), ("startDate", "desc"), ("priority", "asc")])
+def test_get_tasks_list_as_json_matches_pydantic_output(db, sample_user, sort_by, sort_order):
+    marker = fake.uuid4()
+    db.add_all([
+        Task(name=f"{marker} Überprüfung ✓ {i}", description=f"Line {i}\n\"quoted\"", created_by_id=sample_user.id,
+             assignee_id=sample_user.id if i % 2 else None, due_date=date(2025, 6, 1 + i % 3),
+             start_date=None if i % 3 == 0 else date(2025, 5, 20 + i), priority=list(PriorityEnum)[i % 3])
+        for i in range(7)
+    ])
+    db.commit()
+
+    filters = TaskFilters(search=marker)
+    sort = TaskSort(sort_by=sort_by, sort_order=sort_order)
+
+    cursor = None
+    for _ in range(3):
+        tasks, _ = task_service.get_tasks_list(db, filters, sort, limit=3, cursor=cursor, with_total=False)
+        page, _ = task_service.get_tasks_list(db, filters, sort, limit=3, cursor=cursor, with_total=False, as_json=True)
+
+        expected = [GetTaskResponseSchema.model_validate(task).model_dump(by_alias=True, mode="json") for task in tasks]
+        assert json.loads(page.tasks_json) == expected
+        assert page.count == len(tasks)
+        assert task_service.build_page_cursors(page.first, page.last, page.count, sort, 3, cursor) == task_service.build_task_cursors(tasks, sort, 3, cursor)
+
+        next_cursor, _ = task_service.build_task_cursors(tasks, sort, 3, cursor)
+        if next_cursor is None:
+            break
+        cursor = task_service.decode_task_cursor(next_cursor, sort)
+
+    # Paging backwards renders the reversed fetch in display order
+    _, prev_cursor = task_service.build_task_cursors(tasks, sort, 3, cursor)
+    cursor = task_service.decode_task_cursor(prev_cursor, sort)
+    tasks, _ = task_service.get_tasks_list(db, filters, sort, limit=3, cursor=cursor, with_total=False)
+    page, _ = task_service.get_tasks_list(db, filters, sort, limit=3, cursor=cursor, with_total=False, as_json=True)
+    assert json.loads(page.tasks_json) == [GetTaskResponseSchema.model_validate(task).model_dump(by_alias=True, mode="json") for task in tasks]
+
+def test_get_tasks_list_as_json_empty_page(db):
+    page, total = task_service.get_tasks_list(db, TaskFilters(search=fake.uuid4()), TaskSort(), as_json=True)
+
+    assert (page.tasks_json, page.count, page.first, page.last, total) == ("[]", 0, None, None, 0)
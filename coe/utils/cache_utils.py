@@ -0,0 +1,185 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import redis
+
+from coe.utils.metrics_utils import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a time-to-live.
+
+    A `max_size` of 0 disables the cache: `set` becomes a no-op and every
+    `get` is a miss. Lookups of a cache with a `name` are exported as metrics.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60, name: str = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        hit, value = self._lookup(key)
+        if self.name is not None:
+            record_cache_lookup(self.name, hit)
+        return value if hit else default
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return (True, value)
+                del self._entries[key]
+
+            self.misses += 1
+            return (False, None)
+
+    def set(self, key, value, ttl: float = None):
+        if self.max_size <= 0:
+            return
+
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class MemoryCacheBackend:
+    """In-process backend for GenerationalCache, built on TTLCache."""
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60):
+        self.entries = TTLCache(max_size=max_size, ttl=ttl)
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        return self.entries.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self.entries.set(key, value, ttl=ttl)
+
+    def get_counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+
+class RedisCacheBackend:
+    """Networked backend for GenerationalCache; `client` is a redis.Redis or anything with its get/set/incr.
+
+    Redis being unreachable never fails the caller: reads are misses, writes
+    are dropped and an unknown generation counter reads as None.
+    """
+
+    def __init__(self, client, prefix: str = "coe:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str):
+        try:
+            return self.client.get(self.prefix + key)
+        except redis.RedisError as e:
+            logger.warning("Cache read of %s failed: %s", key, e)
+            return None
+
+    def set(self, key: str, value: bytes, ttl: float):
+        try:
+            self.client.set(self.prefix + key, value, ex=max(int(ttl), 1))
+        except redis.RedisError as e:
+            logger.warning("Cache write of %s failed: %s", key, e)
+
+    def get_counter(self, key: str) -> Optional[int]:
+        try:
+            return int(self.client.get(self.prefix + key) or 0)
+        except redis.RedisError as e:
+            logger.warning("Cache read of %s failed: %s", key, e)
+            return None
+
+    def incr(self, key: str) -> Optional[int]:
+        try:
+            return self.client.incr(self.prefix + key)
+        except redis.RedisError as e:
+            # Entries of the current generation stay readable until their TTL runs out
+            logger.error("Cache invalidation of %s failed: %s", key, e)
+            return None
+
+
+class GenerationalCache:
+    """Byte cache whose entries are all invalidated at once by bumping a generation.
+
+    The current generation is part of every key, so invalidation is a single
+    increment that every process sharing the backend sees; entries from older
+    generations are never read again and just expire.
+    """
+
+    def __init__(self, backend, namespace: str, ttl: float = 60):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self._generation_key = f"{namespace}:generation"
+
+    def key(self, parts) -> Optional[str]:
+        # Take the key before reading the data it guards: a write in between
+        # bumps the generation, so a stale result is stored where nobody looks.
+        # Without a known generation there is no safe key, and nothing is cached.
+        generation = self.backend.get_counter(self._generation_key)
+        if generation is None:
+            return None
+        digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+        return f"{self.namespace}:{generation}:{digest}"
+
+    def get(self, key: str):
+        value = self.backend.get(key)
+        record_cache_lookup(self.namespace, value is not None)
+        return value
+
+    def set(self, key: str, value: bytes):
+        self.backend.set(key, value, self.ttl)
+
+    def invalidate(self):
+        self.backend.incr(self._generation_key)
+
+
+def build_cache_backend(kind: str, max_size: int = 1024, ttl: float = 60, redis_url: str = None):
+    """Backend for GenerationalCache by name: "memory", "redis", or "none" for no cache."""
+    if kind == "memory":
+        return MemoryCacheBackend(max_size=max_size, ttl=ttl)
+    if kind == "redis":
+        return RedisCacheBackend(redis.Redis.from_url(redis_url))
+    if kind == "none":
+        return None
+
+    raise ValueError(f"Unknown cache backend: {kind}")
@@ -0,0 +1,76 @@
+import threading
+
+from coe.utils.metrics_utils import record_coalesced_call
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight wait for it and share its result or exception. A waiter gives up
+    after `timeout` seconds and runs the function itself, so a stuck leader
+    only slows its followers down instead of hanging them. Calls of a flight
+    with a `name` are exported as metrics.
+    """
+
+    def __init__(self, timeout: float = 5, name: str = None):
+        self.timeout = timeout
+        self.name = name
+        self.executions = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+        self._record("leader" if leader else "coalesced")
+
+        if leader:
+            try:
+                call.result = fn(*args, **kwargs)
+                return call.result
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if not call.done.wait(self.timeout):
+            with self._lock:
+                self.timeouts += 1
+                self.executions += 1
+            self._record("timeout")
+            return fn(*args, **kwargs)
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def _record(self, result: str):
+        if self.name is not None:
+            record_coalesced_call(self.name, result)
+
+    def stats(self) -> dict:
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "timeouts": self.timeouts,
+            "in_flight": len(self._calls),
+        }
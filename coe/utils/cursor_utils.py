@@ -0,0 +1,20 @@
+import base64
+import json
+
+
+def encode_cursor(payload: dict) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeEncodeError):
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid cursor")
+
+    return payload
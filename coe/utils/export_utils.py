@@ -0,0 +1,41 @@
+import csv
+import io
+import json
+import zlib
+from typing import Iterable, Iterator
+
+from coe.utils.format_utils import schema_field_map, serialize_rows
+
+
+def ndjson_chunks(batches: Iterable[list], schema) -> Iterator[str]:
+    """One JSON object per line, keyed by the schema's aliases; one chunk per batch."""
+    for batch in batches:
+        yield "".join(json.dumps(item, separators=(",", ":")) + "\n" for item in serialize_rows(batch, schema))
+
+
+def csv_chunks(batches: Iterable[list], schema) -> Iterator[str]:
+    """A header row of the schema's aliases, then one chunk of rows per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(alias for _, alias in schema_field_map(schema))
+
+    for batch in batches:
+        for item in serialize_rows(batch, schema):
+            writer.writerow(item.values())
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    # Only the header is left over when there were no rows at all
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def gzip_chunks(chunks: Iterable[str], level: int = 6) -> Iterator[bytes]:
+    """Gzip a stream of text chunks incrementally, without buffering the whole body."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
@@ -1,3 +1,36 @@
+from functools import lru_cache
+from datetime import date, datetime
+from typing import Tuple, Iterable, List, Optional
+import enum
+
+
 def to_camel(string: str) -> str:
     parts = string.split('_')
-    return parts[0] + ''.join(word.capitalize() for word in parts[1:])
\ No newline at end of file
+    return parts[0] + ''.join(word.capitalize() for word in parts[1:])
+
+
+@lru_cache(maxsize=None)
+def schema_field_map(schema) -> Tuple[Tuple[str, str], ...]:
+    """(field name, alias) pairs of a pydantic schema, in declaration order."""
+    return tuple((name, field.alias or name) for name, field in schema.model_fields.items())
+
+
+def to_json_value(value):
+    # Mirrors pydantic's model_dump(mode="json") for the column types we store
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def serialize_rows(rows: Iterable[tuple], schema, fields: Optional[Iterable[str]] = None) -> List[dict]:
+    """Turn rows selected in `schema_field_map(schema)` order into aliased JSON-ready dicts.
+
+    With `fields`, rows hold only those fields (still in schema order).
+    """
+    aliases = [alias for name, alias in schema_field_map(schema) if fields is None or name in fields]
+    return [{alias: to_json_value(value) for alias, value in zip(aliases, row)} for row in rows]
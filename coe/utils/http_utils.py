@@ -0,0 +1,19 @@
+import hashlib
+
+from flask import request, current_app
+
+
+def compute_etag(*parts) -> str:
+    """A stable ETag value for the given version parts."""
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+
+def is_not_modified(etag: str) -> bool:
+    # If-None-Match uses weak comparison, so W/"..." from a proxy still matches
+    return request.if_none_match.contains_weak(etag)
+
+
+def not_modified_response(etag: str):
+    response = current_app.response_class(status=304)
+    response.set_etag(etag)
+    return response
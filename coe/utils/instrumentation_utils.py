@@ -0,0 +1,130 @@
+import cProfile
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, NamedTuple
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryEvent(NamedTuple):
+    """One executed statement, as handed to query listeners."""
+    statement: str
+    parameters: object
+    duration: float
+    executemany: bool
+    connection: object
+
+
+_query_listeners = []
+_listeners_lock = threading.Lock()
+
+
+def add_query_listener(listener: Callable[[QueryEvent], None]):
+    """Call `listener(QueryEvent)` after every statement on any engine.
+
+    The engine events are only installed once the first listener is added, so
+    without listeners queries pay nothing for this.
+    """
+    with _listeners_lock:
+        if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        if listener not in _query_listeners:
+            _query_listeners.append(listener)
+
+
+def remove_query_listener(listener: Callable[[QueryEvent], None]):
+    with _listeners_lock:
+        if listener in _query_listeners:
+            _query_listeners.remove(listener)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, so a statement that raises leaves nothing behind
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    query = QueryEvent(statement, parameters, time.perf_counter() - started, executemany, conn)
+    for listener in tuple(_query_listeners):
+        listener(query)
+
+
+def record_timing(name: str, seconds: float):
+    """Add `seconds` to the current request's `name` timer, if the request is being timed."""
+    if not has_request_context():
+        return
+    timings = g.get("timings")
+    if timings is not None:
+        total, count = timings.get(name, (0.0, 0))
+        timings[name] = (total + seconds, count + 1)
+
+
+@contextmanager
+def timed(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(name, time.perf_counter() - started)
+
+
+def _record_query(query: QueryEvent):
+    record_timing("db", query.duration)
+
+
+def server_timing_header(timings: dict, total: float) -> str:
+    """`Server-Timing` value: one metric per timer, in milliseconds, plus the whole request as `total`."""
+    metrics = [f'{name};dur={seconds * 1000:.2f};desc="{count}x"' for name, (seconds, count) in sorted(timings.items())]
+    metrics.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(metrics)
+
+
+def init_request_instrumentation(app, profile_sample_rate: float = 0, profile_threshold_ms: float = 500, profile_dir: str = "profiles"):
+    """Time DB queries, serialization and bcrypt per request and report them in a Server-Timing header.
+
+    With `profile_sample_rate` above 0 that fraction of requests also runs
+    under cProfile, and the profile is written to `profile_dir` when the
+    request took longer than `profile_threshold_ms`.
+    """
+    add_query_listener(_record_query)
+
+    @app.before_request
+    def start_request_timing():
+        g.timings = {}
+        g.request_started = time.perf_counter()
+        if profile_sample_rate > 0 and random.random() < profile_sample_rate:
+            g.profiler = cProfile.Profile()
+            g.profiler.enable()
+
+    @app.after_request
+    def add_server_timing(response):
+        started = g.get("request_started")
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        response.headers["Server-Timing"] = server_timing_header(g.timings, elapsed)
+
+        profiler = g.pop("profiler", None)
+        if profiler is not None:
+            profiler.disable()
+            if elapsed * 1000 >= profile_threshold_ms:
+                os.makedirs(profile_dir, exist_ok=True)
+                name = f"{time.strftime('%Y%m%dT%H%M%S')}-{request.method}-{request.path.strip('/').replace('/', '_') or 'root'}-{elapsed * 1000:.0f}ms.prof"
+                profiler.dump_stats(os.path.join(profile_dir, name))
+        return response
+
+    @app.teardown_request
+    def stop_profiler(exc):
+        # after_request does not run when the view raised
+        profiler = g.pop("profiler", None)
+        if profiler is not None:
+            profiler.disable()
@@ -0,0 +1,95 @@
+import os
+import time
+from typing import Callable
+
+from flask import g, request
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, CONTENT_TYPE_LATEST, generate_latest, multiprocess
+
+from coe.utils.instrumentation_utils import QueryEvent, add_query_listener
+from coe.utils.sql_utils import get_pool_status
+
+# With PROMETHEUS_MULTIPROC_DIR set, prometheus_client keeps every value in
+# per-process files under that directory and /metrics merges them.
+REQUEST_LATENCY = Histogram(
+    "coe_http_request_duration_seconds", "Time spent handling a request",
+    ["namespace", "route", "method", "status"]
+)
+QUERY_DURATION = Histogram(
+    "coe_db_query_duration_seconds", "Time spent executing a SQL statement",
+    ["operation"],
+    buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5)
+)
+POOL_CHECKED_OUT = Gauge("coe_db_pool_checked_out", "Connections checked out of the pool", ["bind"], multiprocess_mode="livesum")
+POOL_OVERFLOW = Gauge("coe_db_pool_overflow", "Connections open beyond the pool size", ["bind"], multiprocess_mode="livesum")
+POOL_SIZE = Gauge("coe_db_pool_size", "Configured pool size", ["bind"], multiprocess_mode="livesum")
+BCRYPT_DURATION = Histogram(
+    "coe_bcrypt_duration_seconds", "Time spent hashing or verifying a password, including the wait for a hashing worker",
+    ["operation"],
+    buckets=(.01, .025, .05, .1, .2, .3, .5, .75, 1, 2, 5)
+)
+CACHE_LOOKUPS = Counter("coe_cache_lookups_total", "Cache lookups by outcome", ["cache", "result"])
+COALESCED_CALLS = Counter(
+    "coe_coalesced_calls_total", "Calls through a SingleFlight: ran as leader, shared a leader's result, or ran after waiting too long",
+    ["flight", "result"]
+)
+
+QUERY_OPERATIONS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+def record_cache_lookup(cache: str, hit: bool):
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_coalesced_call(flight: str, result: str):
+    COALESCED_CALLS.labels(flight, result).inc()
+
+
+def observe_bcrypt(operation: str, seconds: float):
+    BCRYPT_DURATION.labels(operation).observe(seconds)
+
+
+def _observe_query(query: QueryEvent):
+    operation = query.statement.lstrip()[:6].upper()
+    QUERY_DURATION.labels(operation if operation in QUERY_OPERATIONS else "OTHER").observe(query.duration)
+
+
+def update_pool_gauges(engines: dict, max_overflow: int):
+    for bind, engine in engines.items():
+        status = get_pool_status(engine, max_overflow)
+        bind = bind or "default"
+        POOL_CHECKED_OUT.labels(bind).set(status["checked_out"])
+        POOL_OVERFLOW.labels(bind).set(status["overflow"])
+        POOL_SIZE.labels(bind).set(status["size"])
+
+
+def render_metrics() -> tuple:
+    """(body, content type) of every metric, merged across worker processes when multiprocess mode is on."""
+    registry = REGISTRY
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def init_request_metrics(app, get_engines: Callable[[], dict], max_overflow: int):
+    """Record request latency per namespace and route, query durations and pool gauges."""
+    add_query_listener(_observe_query)
+
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def observe_request(response):
+        started = g.get("metrics_started")
+        if started is None:
+            return response
+
+        # Route templates and restx endpoints ("Task_task_list") keep the label count bounded
+        rule = request.url_rule
+        namespace = request.endpoint.split("_", 1)[0] if rule is not None and "_" in request.endpoint else "none"
+        route = rule.rule if rule is not None else "unmatched"
+        REQUEST_LATENCY.labels(namespace, route, request.method, response.status_code).observe(time.perf_counter() - started)
+
+        update_pool_gauges(get_engines(), max_overflow)
+        return response
@@ -0,0 +1,100 @@
+import logging
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+from typing import Optional
+
+from coe.utils.instrumentation_utils import QueryEvent, add_query_listener
+
+logger = logging.getLogger(__name__)
+
+BUDGET_MODES = ("off", "log", "raise")
+
+_active_budgets = ContextVar("query_budgets", default=())
+_default_mode = "log"
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def set_default_budget_mode(mode: str):
+    """Mode for budgets declared without one, e.g. QUERY_BUDGET_MODE for the route budgets."""
+    global _default_mode
+    if mode not in BUDGET_MODES:
+        raise ValueError(f"Unknown query budget mode: {mode}")
+    _default_mode = mode
+
+
+def _count_query(query: QueryEvent):
+    budgets = _active_budgets.get()
+    for budget in budgets:
+        budget.statements.append(query.statement)
+    # Raised from the statement itself, so a write over budget never gets to commit
+    for budget in budgets:
+        if budget.raises and budget.count == budget.max_queries + 1:
+            raise budget._exceeded()
+
+
+class QueryBudget(ContextDecorator):
+    """Allow at most `max_queries` statements inside a block or decorated function.
+
+    `mode="raise"` raises QueryBudgetExceeded from the first statement over
+    the budget, before the block can commit anything; `mode="log"` logs a
+    warning when the block exits and `mode="off"` does not count at all.
+    Without a mode the one from set_default_budget_mode() applies.
+    Budgets nest, and every enclosing budget counts the statements of the
+    inner ones. Each call of a decorated function gets its own count.
+    """
+
+    def __init__(self, max_queries: int, name: Optional[str] = None, mode: Optional[str] = None):
+        if mode is not None and mode not in BUDGET_MODES:
+            raise ValueError(f"Unknown query budget mode: {mode}")
+        self.max_queries = max_queries
+        self.name = name
+        self.mode = mode
+        self.statements = []
+        self.raises = False
+        self._token = None
+
+    def _recreate_cm(self):
+        return QueryBudget(self.max_queries, self.name, self.mode)
+
+    def __call__(self, fn):
+        if self.name is None:
+            self.name = fn.__qualname__
+        return super().__call__(fn)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _exceeded(self) -> QueryBudgetExceeded:
+        statements = "\n".join(f"  {statement}" for statement in self.statements)
+        return QueryBudgetExceeded(f"{self._message()}:\n{statements}")
+
+    def _message(self) -> str:
+        return f"{self.name or 'Query budget'} ran {self.count} queries, over its budget of {self.max_queries}"
+
+    def __enter__(self):
+        mode = self.mode or _default_mode
+        self.raises = mode == "raise"
+        if mode != "off":
+            add_query_listener(_count_query)
+            self._token = _active_budgets.set(_active_budgets.get() + (self,))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._token is None:
+            return False
+        _active_budgets.reset(self._token)
+        self._token = None
+
+        if self.count <= self.max_queries:
+            return False
+
+        if not self.raises:
+            logger.warning(self._message())
+        elif exc_type is None:
+            # The statement that went over raised, but the block swallowed it
+            raise self._exceeded()
+        return False
@@ -0,0 +1,174 @@
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from flask import current_app, g, has_app_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import scoped_session
+from sqlalchemy.sql.expression import UpdateBase
+
+REPLICA_BIND_KEY = "replica"
+READ_PRIMARY_COOKIE = "read_primary_until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_read_only = ContextVar("read_only", default=False)
+# The session a @read_only call sent to the replica, if any
+_replica_session = ContextVar("replica_session", default=None)
+
+
+def is_connection_error(error: OperationalError) -> bool:
+    # Errors the server reports carry a SQLSTATE; a dead connection does not
+    return error.connection_invalidated or getattr(error.orig, "pgcode", None) is None
+
+
+def read_only(fn):
+    """Mark a service call as safe to answer from a read replica.
+
+    When the replica fails between health probes, it is marked unhealthy and
+    the call runs once more, now against the primary.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        token = _read_only.set(True)
+        replica_token = _replica_session.set(None)
+        try:
+            return fn(*args, **kwargs)
+        except OperationalError as e:
+            session = _replica_session.get()
+            if session is None or not is_connection_error(e):
+                raise
+            # A session on the replica never wrote, so rolling back loses nothing
+            session.rollback()
+            replica_health.mark_unhealthy(session._db.engines[REPLICA_BIND_KEY])
+            _replica_session.set(None)
+            return fn(*args, **kwargs)
+        finally:
+            _replica_session.reset(replica_token)
+            _read_only.reset(token)
+    return wrapper
+
+
+class ReplicaHealth:
+    """Remembers whether the replica answered a probe, re-probing at most every `interval` seconds."""
+
+    def __init__(self, interval: float = 5):
+        self.interval = interval
+        self._checked_at = {}
+        self._healthy = {}
+        self._lock = threading.Lock()
+
+    def is_healthy(self, engine) -> bool:
+        key = id(engine)
+        now = time.monotonic()
+        if now - self._checked_at.get(key, float("-inf")) < self.interval:
+            return self._healthy[key]
+
+        # One thread probes; the rest keep using the last known answer meanwhile
+        if not self._lock.acquire(blocking=False):
+            return self._healthy.get(key, False)
+        try:
+            try:
+                with engine.connect() as connection:
+                    connection.execute(text("SELECT 1"))
+                healthy = True
+            except Exception:
+                healthy = False
+            self._healthy[key] = healthy
+            self._checked_at[key] = time.monotonic()
+            return healthy
+        finally:
+            self._lock.release()
+
+    def mark_unhealthy(self, engine):
+        """Record a failure seen outside a probe; the next probe is due `interval` seconds from now."""
+        key = id(engine)
+        self._healthy[key] = False
+        self._checked_at[key] = time.monotonic()
+
+
+replica_health = ReplicaHealth()
+
+
+class RoutingSession(Session):
+    """Sends reads made under @read_only to the replica bind, everything else to the primary.
+
+    A session that has written anything keeps reading from the primary, as do
+    requests inside a read-your-writes window (see init_replica_routing) and
+    any read while the replica fails its health probe or, since the last
+    probe, a query (see read_only).
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._use_replica(clause):
+            _replica_session.set(self)
+            return self._db.engines[REPLICA_BIND_KEY]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _use_replica(self, clause) -> bool:
+        if isinstance(clause, UpdateBase) or self._flushing or self.new or self.dirty or self.deleted:
+            self.info["wrote"] = True
+            return False
+
+        return _read_only.get() and self.replica_available()
+
+    def replica_available(self) -> bool:
+        """Whether @read_only reads on this session go to the replica right now."""
+        if not has_app_context() or pinned_to_primary(self):
+            return False
+
+        replica = self._db.engines.get(REPLICA_BIND_KEY)
+        return replica is not None and replica_health.is_healthy(replica)
+
+
+def replica_configured() -> bool:
+    """Whether the current app has a replica bind to route reads to."""
+    return has_app_context() and bool(current_app.config.get("SQLALCHEMY_BINDS", {}).get(REPLICA_BIND_KEY))
+
+
+def pinned_to_primary(session) -> bool:
+    """Whether reads on `session` must see the caller's own writes.
+
+    True once the session has written, and for every session of a request
+    inside its read-your-writes window. Callers should then skip caches and
+    shared in-flight queries too, not just the replica. Without a replica
+    every read is on the primary already, and nothing is pinned.
+    """
+    if not replica_configured():
+        return False
+    if session.info.get("wrote"):
+        return True
+    return has_app_context() and bool(g.get("read_primary"))
+
+
+def reads_from_replica(session) -> bool:
+    """Whether @read_only reads on `session` are answered by the replica, whose results may lag."""
+    if isinstance(session, scoped_session):
+        session = session()
+    return isinstance(session, RoutingSession) and session.replica_available()
+
+
+def init_replica_routing(app, read_your_writes_seconds: float, health_check_seconds: float):
+    """Set the replica probe interval and keep each client on the primary for a while after its writes.
+
+    Clients are only pinned when the app has a replica bind.
+    """
+    replica_health.interval = health_check_seconds
+    if read_your_writes_seconds <= 0 or not app.config.get("SQLALCHEMY_BINDS", {}).get(REPLICA_BIND_KEY):
+        return
+
+    @app.before_request
+    def pin_recent_writers_to_primary():
+        try:
+            g.read_primary = float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+        except ValueError:
+            g.read_primary = False
+
+    @app.after_request
+    def mark_write(response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            until = time.time() + read_your_writes_seconds
+            response.set_cookie(READ_PRIMARY_COOKIE, f"{until:.3f}", max_age=int(read_your_writes_seconds) + 1, httponly=True, samesite="Lax")
+        return response
@@ -0,0 +1,150 @@
+import itertools
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from datetime import datetime, date, timezone
+from decimal import Decimal
+
+from flask import has_request_context, request
+
+from coe.utils.cache_utils import TTLCache
+from coe.utils.instrumentation_utils import QueryEvent, add_query_listener, remove_query_listener
+
+SENSITIVE_PARAMETER = re.compile(r"password|token|secret|hash|email", re.IGNORECASE)
+MAX_PARAMETER_LENGTH = 32
+
+_explaining = ContextVar("explaining", default=False)
+
+# Set by init_slow_query_log(); None while slow queries are not recorded
+slow_query_log = None
+
+
+def redact_value(name, value):
+    if name is not None and SENSITIVE_PARAMETER.search(str(name)):
+        return "[REDACTED]"
+    if value is None or isinstance(value, (bool, int, float, Decimal)):
+        return value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, str) and len(value) <= MAX_PARAMETER_LENGTH:
+        return value
+    return f"[{type(value).__name__}, {len(value) if hasattr(value, '__len__') else '?'} long]"
+
+
+def redact_parameters(parameters):
+    """A JSON-friendly copy of bound parameters without secrets or long free text.
+
+    Values of parameters named like a password, token, secret, hash or email
+    are dropped, as are strings longer than MAX_PARAMETER_LENGTH; short
+    strings, numbers and dates stay, since plans depend on them.
+    """
+    if isinstance(parameters, dict):
+        return {name: redact_value(name, value) for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_parameters(item) if isinstance(item, (dict, list, tuple)) else redact_value(None, item) for item in parameters]
+    return redact_value(None, parameters)
+
+
+class SlowQueryLog:
+    """Keeps the last `max_entries` statements that took at least `threshold_ms`.
+
+    Each entry has the SQL, redacted parameters and the route that ran it.
+    Slow SELECTs on a sync engine also get an `EXPLAIN (ANALYZE, BUFFERS)`
+    plan, captured on a background thread with the original parameters and
+    at most one at a time; a statement already explained within
+    `explain_cooldown` seconds, or one arriving while `max_pending` plans are
+    queued, is recorded without a plan.
+    """
+
+    def __init__(self, threshold_ms: float, max_entries: int = 100, explain: bool = True, explain_timeout_ms: int = 5000, explain_cooldown: float = 60, max_pending: int = 16):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.explain_timeout_ms = explain_timeout_ms
+        self.max_pending = max_pending
+        self._entries = deque(maxlen=max_entries)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._explained = TTLCache(max_size=1024, ttl=explain_cooldown)
+        self._pending = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+
+    def entries(self) -> list:
+        """Recorded entries, newest first."""
+        with self._lock:
+            return [dict(entry) for entry in reversed(self._entries)]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def record(self, query: QueryEvent):
+        duration_ms = query.duration * 1000
+        if duration_ms < self.threshold_ms or _explaining.get():
+            return
+
+        entry = {
+            "id": next(self._ids),
+            "recorded_at": datetime.now(timezone.utc),
+            "duration_ms": round(duration_ms, 3),
+            "statement": query.statement,
+            "parameters": redact_parameters(query.parameters),
+            "route": f"{request.method} {request.url_rule.rule if request.url_rule else request.path}" if has_request_context() else None,
+            "plan": None,
+            "plan_status": "not_requested",
+        }
+        if self.explain and self._explainable(query):
+            entry["plan_status"] = self._submit_explain(entry, query)
+
+        with self._lock:
+            self._entries.append(entry)
+
+    def _explainable(self, query: QueryEvent) -> bool:
+        # ANALYZE runs the statement again, so only plain reads qualify, never locking ones
+        engine = query.connection.engine
+        return (
+            not query.executemany
+            and query.statement.lstrip()[:6].upper() == "SELECT"
+            and "FOR UPDATE" not in query.statement.upper()
+            and engine.dialect.name == "postgresql"
+            and not engine.dialect.is_async
+        )
+
+    def _submit_explain(self, entry: dict, query: QueryEvent) -> str:
+        if self._explained.get(query.statement) is not None:
+            return "skipped"
+        with self._lock:
+            if self._pending >= self.max_pending:
+                return "skipped"
+            self._pending += 1
+        self._explained.set(query.statement, True)
+
+        self._executor.submit(self._explain, entry, query.connection.engine, query.statement, query.parameters)
+        return "pending"
+
+    def _explain(self, entry: dict, engine, statement: str, parameters):
+        token = _explaining.set(True)
+        try:
+            with engine.connect() as connection:
+                with connection.begin() as transaction:
+                    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}")
+                    plan = connection.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters).scalar()
+                    transaction.rollback()
+            entry["plan"], entry["plan_status"] = plan, "captured"
+        except Exception as e:
+            entry["plan_status"] = f"failed: {type(e).__name__}"
+        finally:
+            _explaining.reset(token)
+            with self._lock:
+                self._pending -= 1
+
+
+def init_slow_query_log(threshold_ms: float, max_entries: int, explain: bool, explain_timeout_ms: int) -> SlowQueryLog:
+    """Start recording slow statements from every engine into a new SlowQueryLog."""
+    global slow_query_log
+    if slow_query_log is not None:
+        remove_query_listener(slow_query_log.record)
+    slow_query_log = SlowQueryLog(threshold_ms, max_entries, explain=explain, explain_timeout_ms=explain_timeout_ms)
+    add_query_listener(slow_query_log.record)
+    return slow_query_log
@@ -0,0 +1,75 @@
+from sqlalchemy import func, case, event, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+class Explain(Executable, ClauseElement):
+    """`EXPLAIN (<options>) <statement>` with the statement's parameters bound normally."""
+
+    inherit_cache = False
+
+    def __init__(self, statement, options: str = "FORMAT JSON"):
+        self.statement = statement
+        self.options = options
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return f"EXPLAIN ({element.options}) {compiler.process(element.statement, **kw)}"
+
+
+def get_dialect_name(db) -> str:
+    return db.get_bind().dialect.name
+
+
+def indexes_exist(connection, *names: str) -> bool:
+    """Whether every named index exists in the current Postgres schema."""
+    found = connection.execute(
+        text("SELECT count(*) FROM pg_indexes WHERE schemaname = current_schema() AND indexname = ANY(:names)"),
+        {"names": list(names)}
+    ).scalar()
+    return found == len(names)
+
+
+def estimate_row_count(db, statement) -> int:
+    """Row count the Postgres planner expects `statement` to return, without running it."""
+    plan = db.execute(Explain(statement)).scalar()
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def json_timestamp(column):
+    """Render a timestamptz as UTC ISO 8601 text, formatted the way pydantic serializes it."""
+    utc = func.timezone("UTC", column)
+    fraction = case((func.to_char(utc, "US") == "000000", ""), else_=func.to_char(utc, ".US"))
+    return func.to_char(utc, 'YYYY-MM-DD"T"HH24:MI:SS') + fraction + "Z"
+
+
+def set_local_statement_timeout(session, timeout_ms: int):
+    """Apply statement_timeout inside every transaction `session` begins.
+
+    For transaction-pooling proxies such as PgBouncer, where a session-level
+    SET would leak to whichever client gets the server connection next.
+    """
+    def after_begin(session, transaction, connection):
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+
+    event.listen(session, "after_begin", after_begin)
+
+
+def get_pool_status(engine, max_overflow: int) -> dict:
+    """Checked-out/idle counts for a QueuePool; pools that keep no connections report zeros."""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return {"pool_class": type(pool).__name__, "size": 0, "checked_out": 0, "idle": 0, "overflow": 0, "capacity": 0, "utilization": 0.0}
+
+    capacity = pool.size() + max(max_overflow, 0)
+    checked_out = pool.checkedout()
+    return {
+        "pool_class": type(pool).__name__,
+        "size": pool.size(),
+        "checked_out": checked_out,
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "capacity": capacity,
+        "utilization": round(checked_out / capacity, 4) if capacity else 0.0,
+    }
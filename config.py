@@ -1,9 +1,29 @@
 import os
 from dotenv import load_dotenv
+from sqlalchemy.pool import NullPool
 
 env_file_path = ".env.test" if os.getenv("ENV") == "test" else ".env"
 
 load_dotenv(env_file_path)
+
+def build_engine_options(pool_size: int, max_overflow: int, pool_timeout: float, pool_recycle: int,
+                         pool_pre_ping: bool, statement_timeout_ms: int, pgbouncer_mode: bool) -> dict:
+    if pgbouncer_mode:
+        # PgBouncer in transaction mode does the pooling and rejects startup options,
+        # so statement_timeout is applied per transaction with SET LOCAL instead
+        return {"poolclass": NullPool, "pool_pre_ping": pool_pre_ping}
+
+    options = {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": pool_timeout,
+        "pool_recycle": pool_recycle,
+        "pool_pre_ping": pool_pre_ping,
+    }
+    if statement_timeout_ms > 0:
+        options["connect_args"] = {"options": f"-c statement_timeout={statement_timeout_ms}"}
+    return options
+
 class Config:
     DB_USER=os.getenv('DB_USER')
     DB_PASSWORD=os.getenv('DB_PASSWORD')
@@ -17,4 +37,78 @@ class Config:
     ALLOWED_ORIGINS=[origin.strip() for origin in os.getenv('ALLOWED_ORIGINS').split(",") if origin.strip()]
     
     SQLALCHEMY_DATABASE_URI = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    ASYNC_DATABASE_URI = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    DB_POOL_SIZE=int(os.getenv('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW=int(os.getenv('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT=float(os.getenv('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE=int(os.getenv('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING=os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    DB_STATEMENT_TIMEOUT_MS=int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 0))
+    DB_PGBOUNCER_MODE=os.getenv('DB_PGBOUNCER_MODE', 'false').lower() == 'true'
+
+    SQLALCHEMY_ENGINE_OPTIONS = build_engine_options(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        statement_timeout_ms=DB_STATEMENT_TIMEOUT_MS,
+        pgbouncer_mode=DB_PGBOUNCER_MODE
+    )
+
+    # Optional read replica; reads marked @read_only go there when it is healthy
+    DB_REPLICA_URI=os.getenv('DB_REPLICA_URI')
+    SQLALCHEMY_BINDS = {"replica": {"url": DB_REPLICA_URI, **SQLALCHEMY_ENGINE_OPTIONS}} if DB_REPLICA_URI else {}
+    REPLICA_HEALTH_CHECK_SECONDS=float(os.getenv('REPLICA_HEALTH_CHECK_SECONDS', 5))
+    READ_YOUR_WRITES_SECONDS=float(os.getenv('READ_YOUR_WRITES_SECONDS', 5))
+
+    # Serve task endpoints through the asyncpg-based async service. It keeps no
+    # pool: every session opens and closes its own connection, and a list
+    # request with a total uses two at once. At most DB_POOL_SIZE are open per
+    # process, and the sync path is much faster (see benchmarks.api).
+    TASK_ASYNC_ROUTES=os.getenv('TASK_ASYNC_ROUTES', 'false').lower() == 'true'
+
+    BCRYPT_ROUNDS=int(os.getenv('BCRYPT_ROUNDS', 12))
+    HASHING_POOL_WORKERS=int(os.getenv('HASHING_POOL_WORKERS', 2))
+    HASHING_QUEUE_SIZE=int(os.getenv('HASHING_QUEUE_SIZE', 32))
+    HASHING_TIMEOUT_SECONDS=float(os.getenv('HASHING_TIMEOUT_SECONDS', 5))
+
+    TOKEN_CACHE_MAX_SIZE=int(os.getenv('TOKEN_CACHE_MAX_SIZE', 4096))
+    USER_CACHE_TTL_SECONDS=int(os.getenv('USER_CACHE_TTL_SECONDS', 60))
+    USER_CACHE_MAX_SIZE=int(os.getenv('USER_CACHE_MAX_SIZE', 0))
+
+    TASK_BULK_MAX_BATCH_SIZE=int(os.getenv('TASK_BULK_MAX_BATCH_SIZE', 1000))
+    TASK_COUNT_CACHE_BACKEND=os.getenv('TASK_COUNT_CACHE_BACKEND', 'memory')
+    TASK_COUNT_CACHE_TTL_SECONDS=int(os.getenv('TASK_COUNT_CACHE_TTL_SECONDS', 30))
+    TASK_COUNT_CACHE_MAX_SIZE=int(os.getenv('TASK_COUNT_CACHE_MAX_SIZE', 1024))
+    TASK_COUNT_ESTIMATE_THRESHOLD=int(os.getenv('TASK_COUNT_ESTIMATE_THRESHOLD', 0))
+    TASK_EXPORT_BATCH_SIZE=int(os.getenv('TASK_EXPORT_BATCH_SIZE', 1000))
+    TASK_QUERY_COALESCE_TIMEOUT_SECONDS=float(os.getenv('TASK_QUERY_COALESCE_TIMEOUT_SECONDS', 2))
+    TASK_LIST_RENDER_IN_DATABASE=os.getenv('TASK_LIST_RENDER_IN_DATABASE', 'false').lower() == 'true'
+    TASK_LIST_CACHE_BACKEND=os.getenv('TASK_LIST_CACHE_BACKEND', 'none')
+    TASK_LIST_CACHE_TTL_SECONDS=int(os.getenv('TASK_LIST_CACHE_TTL_SECONDS', 30))
+    TASK_LIST_CACHE_MAX_SIZE=int(os.getenv('TASK_LIST_CACHE_MAX_SIZE', 1024))
+
+    REDIS_URL=os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+
+    # Server-Timing headers with per-request DB, serialization and bcrypt time
+    REQUEST_TIMING_ENABLED=os.getenv('REQUEST_TIMING_ENABLED', 'false').lower() == 'true'
+    REQUEST_PROFILE_SAMPLE_RATE=float(os.getenv('REQUEST_PROFILE_SAMPLE_RATE', 0))
+    REQUEST_PROFILE_THRESHOLD_MS=float(os.getenv('REQUEST_PROFILE_THRESHOLD_MS', 500))
+    REQUEST_PROFILE_DIR=os.getenv('REQUEST_PROFILE_DIR', 'profiles')
+
+    # What a route going over its declared query budget does: off, log or raise
+    QUERY_BUDGET_MODE=os.getenv('QUERY_BUDGET_MODE', 'log')
+
+    # Request, query and pool metrics on /metrics; for multi-process servers
+    # also set PROMETHEUS_MULTIPROC_DIR to an empty directory shared by the workers
+    METRICS_ENABLED=os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+
+    # Statements slower than this are kept, with their plan, for /admin/slow-queries; 0 turns it off
+    SLOW_QUERY_THRESHOLD_MS=float(os.getenv('SLOW_QUERY_THRESHOLD_MS', 500))
+    SLOW_QUERY_LOG_SIZE=int(os.getenv('SLOW_QUERY_LOG_SIZE', 100))
+    SLOW_QUERY_EXPLAIN=os.getenv('SLOW_QUERY_EXPLAIN', 'true').lower() == 'true'
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS=int(os.getenv('SLOW_QUERY_EXPLAIN_TIMEOUT_MS', 5000))
+    ADMIN_EMAILS=[email.strip().lower() for email in os.getenv('ADMIN_EMAILS', '').split(",") if email.strip()]
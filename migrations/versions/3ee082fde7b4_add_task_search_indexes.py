@@ -0,0 +1,51 @@
+"""add task search indexes
+
+Revision ID: 3ee082fde7b4
+Revises: 480399d39f27
+Create Date: 2026-10-18 10:02:14.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3ee082fde7b4'
+down_revision: Union[str, None] = '480399d39f27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Must match coe.services.task_service.search_document() for the planner to use it
+    op.create_index(
+        'ix_tasks_search_document', 'tasks',
+        [sa.text("to_tsvector('simple'::regconfig, name || ' ' || description)")],
+        unique=False, postgresql_using='gin'
+    )
+
+    # pg_trgm ships with contrib, which some managed Postgres offerings leave out;
+    # substring search still works without these indexes, it just scans.
+    trgm_available = op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ).scalar()
+    if trgm_available:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+        op.create_index(
+            'ix_tasks_name_trgm', 'tasks', [sa.text('lower(name) gin_trgm_ops')],
+            unique=False, postgresql_using='gin'
+        )
+        op.create_index(
+            'ix_tasks_description_trgm', 'tasks', [sa.text('lower(description) gin_trgm_ops')],
+            unique=False, postgresql_using='gin'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_tasks_description_trgm;")
+    op.execute("DROP INDEX IF EXISTS ix_tasks_name_trgm;")
+    op.drop_index('ix_tasks_search_document', table_name='tasks')
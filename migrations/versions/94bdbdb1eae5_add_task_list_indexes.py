@@ -0,0 +1,59 @@
+"""add task list indexes
+
+Revision ID: 94bdbdb1eae5
+Revises: 3ee082fde7b4
+Create Date: 2026-10-18 10:41:52.207419
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '94bdbdb1eae5'
+down_revision: Union[str, None] = '3ee082fde7b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Filtered by status, then ordered by the active sort column with id as tie-breaker
+    op.create_index('ix_tasks_status_due_date_id', 'tasks', ['status', 'due_date', 'id'], unique=False)
+    op.create_index('ix_tasks_status_start_date_id', 'tasks', ['status', 'start_date', 'id'], unique=False)
+    op.create_index('ix_tasks_status_priority_id', 'tasks', ['status', 'priority', 'id'], unique=False)
+    op.create_index('ix_tasks_status_name_id', 'tasks', ['status', 'name', 'id'], unique=False)
+    op.create_index('ix_tasks_priority_due_date_id', 'tasks', ['priority', 'due_date', 'id'], unique=False)
+
+    # Unfiltered listings ordered by each sortable column
+    op.create_index('ix_tasks_due_date_id', 'tasks', ['due_date', 'id'], unique=False)
+    op.create_index('ix_tasks_start_date_id', 'tasks', ['start_date', 'id'], unique=False)
+    op.create_index('ix_tasks_priority_id', 'tasks', ['priority', 'id'], unique=False)
+    op.create_index('ix_tasks_name_id', 'tasks', ['name', 'id'], unique=False)
+
+    # Boards mostly look at open work, which stays small while completed tasks pile up
+    op.create_index(
+        'ix_tasks_open_due_date_id', 'tasks', ['due_date', 'id'], unique=False,
+        postgresql_where=sa.text("status <> 'completed'")
+    )
+    op.create_index(
+        'ix_tasks_open_priority_due_date_id', 'tasks', ['priority', 'due_date', 'id'], unique=False,
+        postgresql_where=sa.text("status <> 'completed'")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_open_priority_due_date_id', table_name='tasks')
+    op.drop_index('ix_tasks_open_due_date_id', table_name='tasks')
+    op.drop_index('ix_tasks_name_id', table_name='tasks')
+    op.drop_index('ix_tasks_priority_id', table_name='tasks')
+    op.drop_index('ix_tasks_start_date_id', table_name='tasks')
+    op.drop_index('ix_tasks_due_date_id', table_name='tasks')
+    op.drop_index('ix_tasks_priority_due_date_id', table_name='tasks')
+    op.drop_index('ix_tasks_status_name_id', table_name='tasks')
+    op.drop_index('ix_tasks_status_priority_id', table_name='tasks')
+    op.drop_index('ix_tasks_status_start_date_id', table_name='tasks')
+    op.drop_index('ix_tasks_status_due_date_id', table_name='tasks')